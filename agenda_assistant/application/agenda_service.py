@@ -1,18 +1,36 @@
-from typing import List
-from ..domain.entities import AgendaEvent
+from typing import ContextManager, List, Optional
+from ..domain.entities import AgendaEvent, RecurrenceRule, RecurringEvent
 from ..infrastructure.ports.agenda_repository_port import AgendaRepositoryPort
+from ..infrastructure.ports.event_source_port import EventSourcePort
 from ..infrastructure.ports.service_ports import AgendaServicePort
 import html
 import os
+from datetime import date, timedelta
 from pathlib import Path
 
 class AgendaService(AgendaServicePort):
     """Servicio de aplicación - Casos de uso de agenda"""
     
-    def __init__(self, repository: AgendaRepositoryPort):
+    # Máximo de filas rechazadas que se detallan en el resultado de una importación
+    MAX_REJECTED_DETAILS = 10
+    
+    def __init__(self, repository: AgendaRepositoryPort, event_source: Optional[EventSourcePort] = None):
         if repository is None:
             raise ValueError("Repository no puede ser None")
         self._repository = repository
+        self._event_source = event_source
+    
+    def unit_of_work(self) -> ContextManager[None]:
+        """Agrupa los casos de uso de un turno en una lectura y una escritura"""
+        return self._repository.unit_of_work()
+    
+    def prefetch(self, fecha: Optional[str] = None, owner: Optional[int] = None) -> None:
+        """Precarga la agenda (y los eventos de la fecha indicada) fuera del camino crítico"""
+        self._repository.prefetch(fecha, owner)
+    
+    def has_events(self) -> bool:
+        """Indica si la agenda tiene al menos un evento (activo o archivado)"""
+        return bool(self._repository.find_all()) or self._repository.count_archived() > 0
     
     def _sanitize_input(self, text: str) -> str:
         """Sanitiza entrada del usuario para prevenir XSS."""
@@ -20,6 +38,22 @@ class AgendaService(AgendaServicePort):
             raise ValueError("Input debe ser string")
         return html.escape(text.strip())
     
+    @staticmethod
+    def _validate_path(path: str) -> str:
+        """Valida una ruta de archivo (sin escaparla: es una ruta, no texto a mostrar)"""
+        if not isinstance(path, str) or not path.strip():
+            raise ValueError("La ruta del archivo no puede estar vacía")
+        if '\x00' in path:
+            raise ValueError("La ruta del archivo contiene caracteres no válidos")
+        return path.strip()
+    
+    @staticmethod
+    def _format_event_line(event: AgendaEvent) -> str:
+        """Línea de listado para un evento único o una serie recurrente"""
+        if isinstance(event, RecurringEvent):
+            return f"- {event.evento} desde el {event.fecha} a las {event.hora} ({event.regla.describe()})"
+        return f"- {event.evento} el {event.fecha} a las {event.hora}"
+    
     def create_event(self, evento: str, fecha: str, hora: str) -> str:
         """Caso de uso: Crear evento"""
         try:
@@ -44,6 +78,38 @@ class AgendaService(AgendaServicePort):
         except Exception as e:
             return f"Error inesperado: {str(e)}"
     
+    def create_recurring_event(self, evento: str, fecha: str, hora: str,
+                               frecuencia: str, fin: str = "") -> str:
+        """Caso de uso: Crear evento recurrente (una sola fila con su regla)"""
+        try:
+            evento_clean = self._sanitize_input(evento)
+            fecha_clean = self._sanitize_input(fecha)
+            hora_clean = self._sanitize_input(hora)
+            fin_clean = self._sanitize_input(fin or "")
+            
+            # El fin puede ser una fecha límite o un número de repeticiones
+            hasta, repeticiones = None, None
+            if fin_clean.isdigit():
+                repeticiones = int(fin_clean)
+            elif fin_clean:
+                hasta = fin_clean
+            
+            regla = RecurrenceRule(self._sanitize_input(frecuencia), hasta=hasta, repeticiones=repeticiones)
+            event = RecurringEvent(evento_clean, fecha_clean, hora_clean, regla)
+            
+            success = self._repository.save(event)
+            
+            if success:
+                return (f"Evento recurrente '{evento_clean}' agregado desde {fecha_clean} "
+                        f"a las {hora_clean} ({regla.describe()})")
+            else:
+                return "Error al guardar el evento recurrente"
+                
+        except ValueError as e:
+            return f"Error de validación: {str(e)}"
+        except Exception as e:
+            return f"Error inesperado: {str(e)}"
+    
     def get_events_by_date(self, fecha: str) -> str:
         """Caso de uso: Consultar eventos por fecha"""
         try:
@@ -66,30 +132,68 @@ class AgendaService(AgendaServicePort):
             return f"Error al consultar eventos: {str(e)}"
     
     def delete_event(self, evento: str, fecha: str) -> str:
-        """Caso de uso: Eliminar evento"""
+        """Caso de uso: Eliminar evento (nombre exacto, sin distinguir mayúsculas)"""
         try:
             evento_clean = self._sanitize_input(evento)
             fecha_clean = self._sanitize_input(fecha)
             
-            # Verificar si el evento existe antes de eliminar
+            # Verificar si el evento existe antes de eliminar; el nombre aproximado se
+            # resuelve antes, con find_matching_event, para poder confirmarlo
             events = self._repository.find_by_date(fecha_clean)
-            event_exists = any(e.evento.lower() == evento_clean.lower() for e in events)
+            wanted = html.unescape(evento_clean).lower()
+            match = next((e for e in events if html.unescape(e.evento).lower() == wanted), None)
             
-            if not event_exists:
+            if match is None:
                 return f"No se encontró el evento '{evento_clean}' en la fecha {fecha_clean}"
             
-            success = self._repository.delete(evento_clean, fecha_clean)
+            success = self._repository.delete(match.evento, fecha_clean)
             
             if success:
-                return f"Evento '{evento_clean}' eliminado de {fecha_clean}"
+                return f"Evento '{match.evento}' eliminado de {fecha_clean}"
             else:
-                return f"No se pudo eliminar el evento '{evento_clean}' de {fecha_clean}"
+                return f"No se pudo eliminar el evento '{match.evento}' de {fecha_clean}"
                 
         except ValueError as e:
             return f"Error de validación: {str(e)}"
         except Exception as e:
             return f"Error al eliminar evento: {str(e)}"
     
+    def find_matching_event(self, evento: str, fecha: Optional[str] = None) -> Optional[AgendaEvent]:
+        """Caso de uso: Resolver un nombre aproximado al evento almacenado.
+
+        Sin fecha, una serie recurrente se resuelve a su próxima ocurrencia desde hoy
+        (su fecha almacenada es el inicio, que puede haber pasado o estar excluido).
+        """
+        evento_clean = self._sanitize_input(evento)
+        fecha_clean = self._sanitize_input(fecha) if fecha else None
+        matches = self._repository.search_by_name(evento_clean, fecha_clean, limit=1)
+        if not matches:
+            return None
+        match = matches[0]
+        if fecha_clean is None and isinstance(match, RecurringEvent):
+            return match.next_occurrence(date.today().isoformat())
+        return match
+    
+    def search_events(self, texto: str) -> str:
+        """Caso de uso: Buscar eventos por nombre en todas las fechas"""
+        try:
+            texto_clean = self._sanitize_input(texto)
+            events = self._repository.search_by_name(texto_clean)
+            
+            if not events:
+                return f"No se encontraron eventos que coincidan con '{texto_clean}'"
+            
+            result_parts = [f"Eventos que coinciden con '{texto_clean}':"]
+            for event in events:
+                result_parts.append(self._format_event_line(event))
+            
+            return "\n".join(result_parts)
+            
+        except ValueError as e:
+            return f"Error de validación: {str(e)}"
+        except Exception as e:
+            return f"Error al buscar eventos: {str(e)}"
+    
     def get_all_events(self) -> str:
         """Caso de uso: Obtener todos los eventos"""
         try:
@@ -101,7 +205,7 @@ class AgendaService(AgendaServicePort):
             # Optimización: usar lista y join
             result_parts = ["Todos los eventos:"]
             for event in events:
-                result_parts.append(f"- {event.evento} el {event.fecha} a las {event.hora}")
+                result_parts.append(self._format_event_line(event))
             
             return "\n".join(result_parts)
             
@@ -112,9 +216,7 @@ class AgendaService(AgendaServicePort):
         """Caso de uso: Eliminar todos los eventos"""
         try:
             # Verificar si hay eventos para eliminar
-            events = self._repository.find_all()
-            
-            if not events:
+            if not self.has_events():
                 return "No hay eventos para eliminar"
             
             success = self._repository.delete_all()
@@ -127,6 +229,67 @@ class AgendaService(AgendaServicePort):
         except Exception as e:
             return f"Error al eliminar todos los eventos: {str(e)}"
     
+    def import_events(self, import_path: str) -> str:
+        """Caso de uso: Importar eventos desde CSV o iCalendar en una sola escritura"""
+        try:
+            if self._event_source is None:
+                return "La importación de eventos no está disponible"
+            
+            import_path = self._validate_path(import_path)
+            accepted, rejected_count, rejected_details = 0, 0, []
+            
+            # Bloques acotados en memoria; todo se confirma al cerrar la unidad de trabajo
+            with self._repository.unit_of_work():
+                for chunk in self._event_source.read_chunks(import_path):
+                    events = [
+                        AgendaEvent(self._sanitize_input(e.evento), e.fecha, e.hora)
+                        for e in chunk.events
+                    ]
+                    saved = self._repository.save_many(events)
+                    if saved < len(events):
+                        raise IOError("No se pudieron guardar los eventos importados")
+                    accepted += saved
+                    
+                    rejected_count += len(chunk.rejected)
+                    free_slots = self.MAX_REJECTED_DETAILS - len(rejected_details)
+                    rejected_details.extend(chunk.rejected[:max(free_slots, 0)])
+            
+            result_parts = [
+                f"Importación completada: {accepted} eventos agregados, {rejected_count} filas rechazadas"
+            ]
+            for fila, motivo in rejected_details:
+                result_parts.append(f"- Fila {fila}: {motivo}")
+            if rejected_count > len(rejected_details):
+                result_parts.append(f"- ... y {rejected_count - len(rejected_details)} filas rechazadas más")
+            
+            return "\n".join(result_parts)
+            
+        except FileNotFoundError as e:
+            return f"Error de importación: {str(e)}"
+        except ValueError as e:
+            return f"Error de validación: {str(e)}"
+        except Exception as e:
+            return f"Error al importar eventos: {str(e)}"
+    
+    def archive_past_events(self, dias: int) -> str:
+        """Caso de uso: Archivar eventos con más de `dias` días de antigüedad"""
+        try:
+            if dias < 0:
+                raise ValueError("El horizonte de archivado no puede ser negativo")
+            
+            fecha_limite = (date.today() - timedelta(days=dias)).isoformat()
+            archived = self._repository.archive_before(fecha_limite)
+            
+            if archived:
+                return f"{archived} eventos anteriores a {fecha_limite} movidos al archivo"
+            else:
+                return f"No hay eventos anteriores a {fecha_limite} para archivar"
+                
+        except ValueError as e:
+            return f"Error de validación: {str(e)}"
+        except Exception as e:
+            return f"Error al archivar eventos: {str(e)}"
+    
     def export_agenda(self, export_path: str = None) -> str:
         """Caso de uso: Exportar agenda a Excel"""
         try:
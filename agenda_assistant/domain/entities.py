@@ -1,6 +1,7 @@
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+import calendar
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Optional
 
 
 @dataclass
@@ -47,6 +48,183 @@ class AgendaEvent:
         )
 
 
+def _is_iso_date(text: str) -> bool:
+    """Fecha YYYY-MM-DD tal como la usa la expansión de reglas (sin hora ni otros formatos ISO)"""
+    try:
+        return date.fromisoformat(text).isoformat() == text
+    except (TypeError, ValueError):
+        return False
+
+
+@dataclass
+class RecurrenceRule:
+    """Value Object - Regla de recurrencia (diaria, semanal o mensual)"""
+    frecuencia: str
+    intervalo: int = 1
+    hasta: Optional[str] = None
+    repeticiones: Optional[int] = None
+    # Fechas de ocurrencias eliminadas individualmente (siguen contando como repetición)
+    excluir: List[str] = field(default_factory=list)
+
+    FRECUENCIAS = ('DIARIA', 'SEMANAL', 'MENSUAL')
+
+    def __post_init__(self):
+        self.frecuencia = self.frecuencia.upper()
+        if self.frecuencia not in self.FRECUENCIAS:
+            raise ValueError(f"Frecuencia inválida: {self.frecuencia}. Use DIARIA, SEMANAL o MENSUAL")
+        if self.intervalo < 1:
+            raise ValueError("El intervalo de recurrencia debe ser mayor que cero")
+        if self.hasta and not _is_iso_date(self.hasta):
+            raise ValueError(f"Fecha límite inválida: {self.hasta}. Use formato YYYY-MM-DD")
+        if self.repeticiones is not None and self.repeticiones < 1:
+            raise ValueError("El número de repeticiones debe ser mayor que cero")
+        for fecha in self.excluir:
+            if not _is_iso_date(fecha):
+                raise ValueError(f"Fecha excluida inválida: {fecha}. Use formato YYYY-MM-DD")
+        self.excluir = sorted(set(self.excluir))
+
+    def to_string(self) -> str:
+        """Serializa la regla en un texto compacto (ej: SEMANAL;INTERVALO=1;HASTA=2024-06-30)"""
+        parts = [self.frecuencia, f"INTERVALO={self.intervalo}"]
+        if self.hasta:
+            parts.append(f"HASTA={self.hasta}")
+        if self.repeticiones is not None:
+            parts.append(f"REPETICIONES={self.repeticiones}")
+        if self.excluir:
+            parts.append(f"EXCLUIR={','.join(self.excluir)}")
+        return ";".join(parts)
+
+    def describe(self) -> str:
+        """Descripción legible de la regla (ej: semanal, hasta 2024-06-30)"""
+        if self.intervalo == 1:
+            text = self.frecuencia.lower()
+        else:
+            unidades = {'DIARIA': 'días', 'SEMANAL': 'semanas', 'MENSUAL': 'meses'}
+            text = f"cada {self.intervalo} {unidades[self.frecuencia]}"
+        if self.hasta:
+            text += f", hasta {self.hasta}"
+        if self.repeticiones is not None:
+            text += f", {self.repeticiones} veces"
+        if self.excluir:
+            text += f", excepto {', '.join(self.excluir)}"
+        return text
+
+    @classmethod
+    def from_string(cls, text: str) -> 'RecurrenceRule':
+        parts = [part.strip() for part in text.split(';') if part.strip()]
+        if not parts:
+            raise ValueError("Regla de recurrencia vacía")
+        options = dict(part.split('=', 1) for part in parts[1:] if '=' in part)
+        return cls(
+            frecuencia=parts[0],
+            intervalo=int(options.get('INTERVALO', 1)),
+            hasta=options.get('HASTA') or None,
+            repeticiones=int(options['REPETICIONES']) if options.get('REPETICIONES') else None,
+            excluir=[fecha.strip() for fecha in options.get('EXCLUIR', '').split(',') if fecha.strip()]
+        )
+
+    def _nth_date(self, inicio: date, n: int) -> Optional[date]:
+        """Fecha de la ocurrencia n (None si el día no existe en ese mes)"""
+        if self.frecuencia == 'DIARIA':
+            return inicio + timedelta(days=n * self.intervalo)
+        if self.frecuencia == 'SEMANAL':
+            return inicio + timedelta(weeks=n * self.intervalo)
+        month_index = inicio.month - 1 + n * self.intervalo
+        year, month = inicio.year + month_index // 12, month_index % 12 + 1
+        if inicio.day > calendar.monthrange(year, month)[1]:
+            return None  # Ej: día 31 en un mes de 30 días
+        return date(year, month, inicio.day)
+
+    def _first_index_from(self, inicio: date, desde: date) -> int:
+        """Índice de la primera ocurrencia candidata >= desde, sin recorrer las anteriores"""
+        if desde <= inicio:
+            return 0
+        if self.frecuencia == 'DIARIA':
+            step = self.intervalo
+            return -(-(desde - inicio).days // step)
+        if self.frecuencia == 'SEMANAL':
+            step = 7 * self.intervalo
+            return -(-(desde - inicio).days // step)
+        months = (desde.year - inicio.year) * 12 + desde.month - inicio.month
+        return max(0, months // self.intervalo)
+
+    def iter_dates(self, inicio: str, desde: str, hasta: str) -> Iterator[str]:
+        """Genera perezosamente las fechas de la regla dentro de [desde, hasta]"""
+        start = date.fromisoformat(inicio)
+        range_start = date.fromisoformat(desde)
+        range_end = date.fromisoformat(hasta)
+        if self.hasta:
+            range_end = min(range_end, date.fromisoformat(self.hasta))
+
+        # Con día > 28 los meses sin ese día no cuentan como repetición: se recorre desde el inicio
+        count_valid = self.frecuencia == 'MENSUAL' and start.day > 28 and self.repeticiones is not None
+        excluded = set(self.excluir)
+        n = 0 if count_valid else self._first_index_from(start, range_start)
+        found = 0
+        while self.repeticiones is None or (found if count_valid else n) < self.repeticiones:
+            current = self._nth_date(start, n)
+            n += 1
+            if current is None:
+                continue
+            found += 1
+            if current < range_start:
+                continue
+            if current > range_end:
+                return
+            if current.isoformat() in excluded:
+                continue
+            yield current.isoformat()
+
+
+@dataclass
+class RecurringEvent(AgendaEvent):
+    """Entidad de dominio - Evento recurrente almacenado como un único registro"""
+    regla: RecurrenceRule = None
+
+    def _validate(self):
+        super()._validate()
+        if self.regla is None:
+            raise ValueError("Un evento recurrente requiere una regla de recurrencia")
+        if not _is_iso_date(self.fecha):
+            raise ValueError(f"Fecha inválida: {self.fecha}. Use formato YYYY-MM-DD")
+        if self.regla.hasta and self.regla.hasta < self.fecha:
+            raise ValueError(f"La fecha límite {self.regla.hasta} es anterior al inicio {self.fecha}")
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data['Recurrencia'] = self.regla.to_string()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RecurringEvent':
+        if not data.get('Recurrencia'):
+            raise ValueError("Clave requerida 'Recurrencia' no encontrada")
+        return cls(
+            evento=data['Evento'],
+            fecha=data['Fecha'],
+            hora=data['Hora'],
+            regla=RecurrenceRule.from_string(data['Recurrencia'])
+        )
+
+    def without_occurrence(self, fecha: str) -> Optional['RecurringEvent']:
+        """Serie sin la ocurrencia de la fecha (None si no le quedan ocurrencias)"""
+        regla = RecurrenceRule(self.regla.frecuencia, self.regla.intervalo, self.regla.hasta,
+                               self.regla.repeticiones, self.regla.excluir + [fecha])
+        remaining = RecurringEvent(self.evento, self.fecha, self.hora, regla)
+        if next(regla.iter_dates(self.fecha, self.fecha, date.max.isoformat()), None) is None:
+            return None
+        return remaining
+
+    def next_occurrence(self, desde: str) -> Optional[AgendaEvent]:
+        """Primera ocurrencia no excluida a partir de la fecha (None si la serie terminó)"""
+        return next(self.occurrences(desde, date.max.isoformat()), None)
+
+    def occurrences(self, desde: str, hasta: str) -> Iterator[AgendaEvent]:
+        """Expande perezosamente las ocurrencias dentro del rango consultado"""
+        for fecha in self.regla.iter_dates(self.fecha, desde, hasta):
+            yield AgendaEvent(self.evento, fecha, self.hora)
+
+
 @dataclass
 class EventQuery:
     """Value Object para consultas"""
@@ -0,0 +1,166 @@
+import pandas as pd
+import os
+import json
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from .event_name_index import EventNameIndex
+from ...domain.entities import AgendaEvent
+
+
+class AgendaArchive:
+    """Almacén frío de eventos pasados: particiones mensuales comprimidas e índice por fecha"""
+
+    COLUMNS = ['Evento', 'Fecha', 'Hora']
+    INDEX_FILE = 'indice.json'
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._date_index: Optional[Dict[str, int]] = None
+        self._index_mtime: Optional[int] = None
+        # Índice de nombres de todo el archivo, ligado a la versión de indice.json
+        self._name_index: Optional[EventNameIndex] = None
+        self._name_index_mtime: Optional[int] = None
+
+    def _partition_path(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"{month}.csv.gz")
+
+    def _index_path(self) -> str:
+        return os.path.join(self.archive_dir, self.INDEX_FILE)
+
+    @staticmethod
+    def _replace_atomically(path: str, write: Callable[[str], None]):
+        """Escribe en un temporal propio del proceso e hilo y lo renombra sobre el destino"""
+        # Otro proceso (ej: el archivado programado) puede estar escribiendo el mismo archivo
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load_index(self) -> Dict[str, int]:
+        """Índice fecha -> número de eventos archivados (se relee solo si cambió en disco)"""
+        try:
+            mtime = os.stat(self._index_path()).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._date_index is None or mtime != self._index_mtime:
+            if mtime is None:
+                self._date_index = {}
+            else:
+                with open(self._index_path(), encoding='utf-8') as handle:
+                    self._date_index = json.load(handle)
+            self._index_mtime = mtime
+        return self._date_index
+
+    def _save_index(self):
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        def write(tmp_path: str):
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump(self._date_index, handle, ensure_ascii=False, sort_keys=True)
+
+        self._replace_atomically(self._index_path(), write)
+        self._index_mtime = os.stat(self._index_path()).st_mtime_ns
+
+    def _read_partition(self, month: str) -> pd.DataFrame:
+        path = self._partition_path(month)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=self.COLUMNS)
+        return pd.read_csv(path, dtype=str, keep_default_na=False, compression='gzip')
+
+    def _write_partition(self, month: str, df: pd.DataFrame):
+        path = self._partition_path(month)
+        if df.empty:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(self.archive_dir, exist_ok=True)
+        self._replace_atomically(
+            path, lambda tmp_path: df[self.COLUMNS].to_csv(tmp_path, index=False, compression='gzip')
+        )
+
+    def has_date(self, fecha: str) -> bool:
+        """Indica, sin abrir particiones, si hay eventos archivados en la fecha"""
+        with self._lock:
+            return self._load_index().get(fecha, 0) > 0
+
+    def count(self) -> int:
+        with self._lock:
+            return sum(self._load_index().values())
+
+    def append(self, df: pd.DataFrame) -> int:
+        """Archiva las filas, agrupadas por mes, y actualiza el índice de fechas"""
+        if df.empty:
+            return 0
+        with self._lock:
+            index = self._load_index()
+            df = df[self.COLUMNS].astype(str)
+            for month, rows in df.groupby(df['Fecha'].str[:7]):
+                partition = pd.concat([self._read_partition(month), rows], ignore_index=True)
+                # Evita duplicados si un archivado anterior se interrumpió a mitad
+                partition = partition.drop_duplicates(ignore_index=True)
+                self._write_partition(month, partition)
+                for fecha, total in partition['Fecha'].value_counts().items():
+                    index[fecha] = int(total)
+            self._save_index()
+            return len(df)
+
+    def find_by_date(self, fecha: str) -> List[dict]:
+        """Filas archivadas de la fecha (solo abre la partición de su mes)"""
+        if not self.has_date(fecha):
+            return []
+        with self._lock:
+            partition = self._read_partition(fecha[:7])
+            return partition[partition['Fecha'] == fecha].to_dict('records')
+
+    def search(self, texto: str, limit: int = 10) -> List[Tuple[float, AgendaEvent]]:
+        """Busca por nombre en todo el archivo; el índice se reconstruye solo si el archivo cambió"""
+        with self._lock:
+            index = self._load_index()
+            if not index:
+                return []
+            if self._name_index is None or self._name_index_mtime != self._index_mtime:
+                months = sorted({fecha[:7] for fecha in index})
+                self._name_index = EventNameIndex.from_rows(
+                    (row for month in months for row in self._read_partition(month).to_dict('records')),
+                    AgendaEvent.from_dict
+                )
+                self._name_index_mtime = self._index_mtime
+            return self._name_index.search(texto, limit=limit)
+    
+    def delete(self, evento: str, fecha: str) -> bool:
+        """Elimina un evento archivado"""
+        if not self.has_date(fecha):
+            return False
+        with self._lock:
+            month = fecha[:7]
+            partition = self._read_partition(month)
+            remaining = partition[~((partition['Evento'] == evento) & (partition['Fecha'] == fecha))]
+            if len(remaining) == len(partition):
+                return False
+            self._write_partition(month, remaining)
+            index = self._load_index()
+            left = int((remaining['Fecha'] == fecha).sum())
+            if left:
+                index[fecha] = left
+            else:
+                index.pop(fecha, None)
+            self._save_index()
+            return True
+
+    def clear(self) -> bool:
+        """Elimina todo el archivo; devuelve True si había eventos"""
+        with self._lock:
+            index = self._load_index()
+            had_events = bool(index)
+            for month in {fecha[:7] for fecha in index}:
+                self._write_partition(month, pd.DataFrame(columns=self.COLUMNS))
+            self._date_index = {}
+            if os.path.isdir(self.archive_dir):
+                self._save_index()
+            return had_events
@@ -0,0 +1,126 @@
+"""Adaptador de entrada por lotes: procesa archivos JSONL de consultas."""
+import json
+import logging
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, IO, List, Optional
+from ..ports.service_ports import AIAgentPort
+
+
+class BatchAdapter:
+    """Adaptador de entrada headless: una línea JSONL por consulta, un agente por usuario.
+
+    Las consultas de un mismo usuario se procesan en orden (comparten el estado del
+    agente); las de usuarios distintos se reparten en un pool acotado de hilos, de
+    modo que las llamadas al LLM corren en paralelo mientras que las escrituras
+    quedan serializadas por la unidad de trabajo del repositorio.
+    """
+
+    def __init__(self, agent_factory: Callable[[str], AIAgentPort], max_workers: int = 4,
+                 metrics_provider: Optional[Callable[[], Dict[str, float]]] = None):
+        if agent_factory is None:
+            raise ValueError("agent_factory no puede ser None")
+        if max_workers < 1:
+            raise ValueError("max_workers debe ser mayor que cero")
+        self.agent_factory = agent_factory
+        self.max_workers = max_workers
+        self.metrics_provider = metrics_provider
+        self.logger = logging.getLogger(__name__)
+        self._output_lock = threading.Lock()
+
+    def _read_requests(self, source: IO[str]) -> "OrderedDict[str, List[dict]]":
+        """Agrupa las solicitudes por usuario conservando el orden de llegada"""
+        by_user: "OrderedDict[str, List[dict]]" = OrderedDict()
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                user, query = str(data["user"]).strip(), str(data["query"])
+            except (ValueError, KeyError, TypeError) as e:
+                self.logger.error(f"Línea {line_number} inválida: {e}")
+                by_user.setdefault("", []).append({"line": line_number, "error": f"Línea inválida: {e}"})
+                continue
+            by_user.setdefault(user, []).append({"line": line_number, "user": user, "query": query})
+        return by_user
+
+    def _write_result(self, sink: IO[str], result: dict):
+        with self._output_lock:
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+            sink.flush()
+
+    def _process_user(self, user: str, requests: List[dict], sink: IO[str]) -> List[dict]:
+        """Procesa secuencialmente las consultas de un usuario con su propio agente"""
+        agent = self.agent_factory(user) if user else None
+        results = []
+        for request in requests:
+            result = dict(request)
+            if "error" not in request:
+                start = time.perf_counter()
+                try:
+                    result["response"] = agent.process_natural_language(request["query"])
+                except Exception as e:
+                    self.logger.error(f"Error procesando línea {request['line']}: {e}")
+                    result["error"] = str(e)
+                result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            self._write_result(sink, result)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _percentile(values: List[float], percent: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def run(self, source: IO[str], sink: IO[str]) -> Dict[str, float]:
+        """Procesa todas las solicitudes y devuelve el resumen de rendimiento"""
+        by_user = self._read_requests(source)
+        start = time.perf_counter()
+
+        results: List[dict] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch") as executor:
+            futures = [
+                executor.submit(self._process_user, user, requests, sink)
+                for user, requests in by_user.items()
+            ]
+            for future in as_completed(futures):
+                results.extend(future.result())
+
+        elapsed = time.perf_counter() - start
+        latencies = [r["latency_ms"] for r in results if "latency_ms" in r]
+        errors = sum(1 for r in results if "error" in r)
+        summary = {
+            "total": len(results),
+            "ok": len(results) - errors,
+            "errors": errors,
+            "users": len([user for user in by_user if user]),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_p50_ms": self._percentile(latencies, 50),
+            "latency_p95_ms": self._percentile(latencies, 95),
+            "latency_max_ms": max(latencies, default=0.0),
+        }
+        if self.metrics_provider is not None:
+            summary.update(self.metrics_provider())
+        return summary
+
+    @staticmethod
+    def print_summary(summary: Dict[str, float], stream: IO[str] = sys.stderr):
+        """Imprime el resumen de rendimiento al final del lote"""
+        stream.write(
+            "Resumen: {total} solicitudes ({ok} ok, {errors} con error) de {users} usuarios en {elapsed_s}s\n"
+            "Rendimiento: {throughput_rps} solicitudes/s | latencia p50={latency_p50_ms}ms "
+            "p95={latency_p95_ms}ms máx={latency_max_ms}ms\n".format(**summary)
+        )
+        if "llm_calls" in summary:
+            stream.write(
+                "LLM: {llm_calls} llamadas ({llm_coalesced} deduplicadas) | espera en cola "
+                "prom={llm_wait_avg_ms}ms p95={llm_wait_p95_ms}ms máx={llm_wait_max_ms}ms\n".format(**summary)
+            )
@@ -0,0 +1,125 @@
+"""Índice invertido de trigramas sobre los nombres de eventos."""
+import html
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from ...domain.entities import AgendaEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventNameIndex:
+    """Índice token/trigrama para búsqueda y coincidencia aproximada por nombre."""
+
+    # Palabras vacías que no aportan a la coincidencia ("la reunión con Ana")
+    STOP_WORDS = frozenset({
+        'el', 'la', 'los', 'las', 'un', 'una', 'de', 'del', 'al', 'a',
+        'con', 'en', 'y', 'mi', 'mis', 'para', 'por'
+    })
+
+    def __init__(self, events: Iterable[AgendaEvent] = ()):
+        self._events: List[AgendaEvent] = []
+        self._names: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        for event in events:
+            self.add(event)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]],
+                  convert: Callable[[Dict[str, Any]], AgendaEvent]) -> 'EventNameIndex':
+        """Indexa filas almacenadas, omitiendo con un aviso las que no se pueden convertir.
+
+        Una fila editada a mano (ej: sin hora) no debe impedir buscar el resto de eventos.
+        """
+        index = cls()
+        for row in rows:
+            try:
+                event = convert(row)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Fila omitida del índice de nombres ({row.get('Evento')!r}): {e}")
+                continue
+            index.add(event)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @classmethod
+    def _normalize(cls, text: str) -> List[str]:
+        """Minúsculas, sin tildes ni entidades HTML, sin palabras vacías"""
+        text = unicodedata.normalize('NFKD', html.unescape(str(text)).lower())
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+        words = re.findall(r'\w+', text)
+        return [w for w in words if w not in cls.STOP_WORDS] or words
+
+    @staticmethod
+    def _exact_key(text: str) -> str:
+        """Clave para la coincidencia exacta: sin entidades HTML, sin espacios extra, sin mayúsculas"""
+        return ' '.join(html.unescape(str(text)).split()).casefold()
+
+    @classmethod
+    def _trigrams(cls, text: str) -> Set[str]:
+        """Trigramas de cada palabra, con relleno para marcar inicio y fin"""
+        grams = set()
+        for word in cls._normalize(text):
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return grams
+
+    def add(self, event: AgendaEvent) -> None:
+        """Indexa un evento"""
+        doc_id = len(self._events)
+        grams = self._trigrams(event.evento)
+        self._events.append(event)
+        self._names.append(self._exact_key(event.evento))
+        self._grams.append(grams)
+        for gram in grams:
+            self._postings[gram].add(doc_id)
+
+    def search(self, text: str, limit: int = 10, min_score: float = 0.3,
+               predicate: Optional[Callable[[AgendaEvent], Optional[AgendaEvent]]] = None
+               ) -> List[Tuple[float, AgendaEvent]]:
+        """Busca por similitud de trigramas; solo recorre las listas de los trigramas de la consulta.
+
+        `predicate` puede filtrar o transformar cada candidato (None lo descarta).
+        Los nombres idénticos a la consulta (sin distinguir mayúsculas) van siempre primero.
+        """
+        query_grams = self._trigrams(text)
+        if not query_grams:
+            return []
+        query_key = self._exact_key(text)
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for doc_id in self._postings.get(gram, ()):
+                shared[doc_id] += 1
+
+        scored = []
+        for doc_id, common in shared.items():
+            # Promedio entre cobertura de la consulta y coeficiente de Dice
+            coverage = common / len(query_grams)
+            dice = 2 * common / (len(query_grams) + len(self._grams[doc_id]))
+            score = (coverage + dice) / 2
+            exact = self._names[doc_id] == query_key
+            if exact:
+                score = 1.0
+            if score >= min_score:
+                scored.append((not exact, -score, doc_id))
+        # Exactos primero; luego por puntuación y, a igualdad, en orden de inserción
+        scored.sort()
+
+        results = []
+        for _, negative_score, doc_id in scored:
+            score = -negative_score
+            event = self._events[doc_id]
+            if predicate is not None:
+                event = predicate(event)
+                if event is None:
+                    continue
+            results.append((score, event))
+            if len(results) >= limit:
+                break
+        return results
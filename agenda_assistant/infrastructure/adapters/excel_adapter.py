@@ -1,28 +1,334 @@
 import pandas as pd
+import errno
 import os
+import shutil
 import logging
-from typing import List
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from ..ports.agenda_repository_port import AgendaRepositoryPort
-from ...domain.entities import AgendaEvent
+from .archive_store import AgendaArchive
+from .event_name_index import EventNameIndex
+from ...domain.entities import AgendaEvent, RecurringEvent
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow llega como dependencia de streamlit
+    pa = None
+    feather = None
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+class _FileWriteLock:
+    """Bloqueo de escritura de un archivo: reentrante en el hilo, exclusivo entre hilos y procesos.
+
+    Hay uno por ruta en cada proceso (lo comparten, ej: los adaptadores de cada sesión de
+    Streamlit); entre procesos se usa un bloqueo del sistema sobre un archivo .lock.
+    """
+
+    _instances: Dict[str, '_FileWriteLock'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, lock_path: str):
+        self.lock_path = lock_path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+
+    @classmethod
+    def for_file(cls, file_path: str) -> '_FileWriteLock':
+        key = os.path.normcase(os.path.realpath(file_path))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(file_path + '.lock')
+            return cls._instances[key]
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._lock_file()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                self._unlock_file()
+        finally:
+            self._thread_lock.release()
+
+    def _lock_file(self):
+        handle = open(self.lock_path, 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            else:  # pragma: no cover - Windows
+                handle.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK se rinde tras unos segundos: seguir esperando
+        except BaseException:
+            handle.close()
+            raise
+        self._handle = handle
+
+    def _unlock_file(self):
+        handle, self._handle = self._handle, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            handle.close()
+
 
 class ExcelAgendaAdapter(AgendaRepositoryPort):
     """Adaptador de salida - Implementación para Excel"""
     
-    def __init__(self, file_path: str):
+    COLUMNS = ['Evento', 'Fecha', 'Hora', 'Recurrencia']
+    
+    # Clave de metadatos del snapshot columnar con la firma del .xlsx de origen
+    SNAPSHOT_SIGNATURE_KEY = b'agenda_xlsx_signature'
+    
+    # Precargas pendientes de consumir como máximo (una por hilo que las pidió)
+    MAX_PREFETCHED = 16
+    
+    def __init__(self, file_path: str, use_snapshot: bool = True, archive: Optional[AgendaArchive] = None,
+                 keep_in_memory: bool = False):
         self.file_path = file_path
         self.logger = logging.getLogger(__name__)
+        # Almacén frío opcional para eventos pasados fuera de la agenda activa
+        self.archive = archive
+        # Snapshot columnar (Arrow/Feather) junto al Excel para lecturas rápidas
+        self.snapshot_path = os.path.splitext(file_path)[0] + '.feather'
+        self.use_snapshot = use_snapshot and pa is not None
+        # Índice de nombres junto a la firma del Excel con que se construyó (se asignan juntos)
+        self._name_index: Optional[Tuple[Optional[str], EventNameIndex]] = None
+        # Unidad de trabajo por hilo: snapshot leído una vez y escrituras en búfer
+        self._uow = threading.local()
+        # Escrituras serializadas por archivo: entre hilos del proceso y entre procesos (.lock)
+        self._write_lock = _FileWriteLock.for_file(file_path)
+        # Snapshots precargados en segundo plano, por hilo consumidor
+        self._prefetched: "OrderedDict[int, tuple]" = OrderedDict()
+        self._prefetch_lock = threading.Lock()
+        # Copia en memoria de la agenda (proceso propietario único, ej: servidor de repositorio)
+        self.keep_in_memory = keep_in_memory
+        self._hot: Optional[tuple] = None
         self._ensure_file_exists()
     
     def _ensure_file_exists(self):
         """Asegura que el archivo Excel existe"""
         if not os.path.exists(self.file_path):
-            df = pd.DataFrame(columns=['Evento', 'Fecha', 'Hora'])
+            df = pd.DataFrame(columns=self.COLUMNS)
             df.to_excel(self.file_path, index=False)
     
+    def _file_signature(self) -> Optional[str]:
+        """Firma (mtime, tamaño) del Excel para detectar cambios externos"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    
+    def _read_snapshot(self, signature: str) -> Optional[pd.DataFrame]:
+        """Lee el snapshot columnar mapeado en memoria si sigue vigente"""
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(self.snapshot_path, 'r'))
+            metadata = reader.schema.metadata or {}
+            if metadata.get(self.SNAPSHOT_SIGNATURE_KEY) != signature.encode():
+                return None  # El Excel cambió: el snapshot está obsoleto
+            return reader.read_all().to_pandas()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Snapshot columnar ilegible, se regenerará: {e}")
+            return None
+    
+    def _write_snapshot(self, df: pd.DataFrame, signature: Optional[str]):
+        """Regenera el snapshot columnar a partir del DataFrame del Excel"""
+        if signature is None:
+            return
+        # Temporal por hilo: un lector puede regenerarlo mientras otro hilo escribe
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            table = pa.Table.from_pandas(df.astype(object), preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[self.SNAPSHOT_SIGNATURE_KEY] = signature.encode()
+            table = table.replace_schema_metadata(metadata)
+            # Sin compresión para que la lectura pueda mapear las páginas tal cual
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            self.logger.warning(f"No se pudo escribir el snapshot columnar: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    def _in_unit_of_work(self) -> bool:
+        return getattr(self._uow, 'active', False)
+    
+    def _lock_for_write(self):
+        """Toma los bloqueos de escritura de la unidad de trabajo antes de su primera escritura.
+
+        Las unidades de solo lectura no bloquean a nadie. Si el Excel cambió desde que se
+        leyó el snapshot, todavía no hay nada en búfer: se descarta y se vuelve a leer.
+        """
+        if self._uow.locked:
+            return
+        self._write_lock.__enter__()
+        self._uow.locked = True
+        if self._uow.df is not None and self._uow.signature != self._file_signature():
+            self._uow.df = None
+            self._uow.name_index = None
+            self._uow.dates = {}
+    
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Bloque de escritura: dentro de la unidad de trabajo activa o en una propia"""
+        if self._in_unit_of_work():
+            self._lock_for_write()
+            yield
+            return
+        with self.unit_of_work():
+            self._lock_for_write()
+            yield
+    
+    @contextmanager
+    def unit_of_work(self) -> Iterator[None]:
+        """Implementa el puerto: una lectura y como máximo una escritura por bloque"""
+        if self._in_unit_of_work():
+            # Unidad anidada: se integra en la exterior, deshaciendo sus cambios si falla
+            df = self._uow.df
+            savepoint = (df.copy() if df is not None else None, list(self._uow.pending),
+                         list(self._uow.after_commit), self._uow.dirty)
+            try:
+                yield
+            except BaseException:
+                self._uow.df, self._uow.pending, self._uow.after_commit, self._uow.dirty = savepoint
+                self._uow.name_index = None
+                self._uow.dates = {}
+                raise
+            return
+        
+        self._uow.active = True
+        self._uow.df = None
+        self._uow.signature = None
+        self._uow.pending = []
+        self._uow.after_commit = []
+        self._uow.dirty = False
+        self._uow.name_index = None
+        self._uow.dates = {}
+        self._uow.locked = False
+        try:
+            yield
+            if self._uow.dirty:
+                df = self._load_dataframe()
+                # Nadie más escribe mientras se tienen los bloqueos; un cambio aquí es una edición externa
+                if self._file_signature() != self._uow.signature:
+                    raise RuntimeError(f"{self.file_path} se modificó fuera de la aplicación durante "
+                                       "la operación; no se guardaron los cambios, vuelve a intentarlo")
+                self._write_dataframe(df)
+            actions, self._uow.after_commit = self._uow.after_commit, []
+            for action in actions:
+                action()
+        finally:
+            locked, self._uow.locked = self._uow.locked, False
+            self._uow.active = False
+            self._uow.df = None
+            self._uow.signature = None
+            self._uow.pending = []
+            self._uow.after_commit = []
+            self._uow.name_index = None
+            self._uow.dates = {}
+            if locked:
+                self._write_lock.__exit__(None, None, None)
+    
+    def _after_commit(self, action: Callable[[], object]):
+        """Ejecuta la acción tras confirmar la unidad de trabajo (o ya, si no hay ninguna activa)"""
+        if self._in_unit_of_work():
+            self._uow.after_commit.append(action)
+        else:
+            action()
+    
+    def prefetch(self, fecha: Optional[str] = None, owner: Optional[int] = None) -> None:
+        """Implementa el puerto: precarga el snapshot (y los eventos de una fecha) para el hilo `owner`"""
+        try:
+            owner = threading.get_ident() if owner is None else owner
+            signature = self._file_signature()
+            df = self._read_dataframe()
+            dates = {fecha: self._events_on_date(df, fecha)} if fecha else {}
+            cached = self._name_index
+            if cached is None or cached[0] != signature:
+                self._name_index = (signature, self._build_name_index(df))
+            with self._prefetch_lock:
+                self._prefetched[owner] = (signature, df, dates)
+                self._prefetched.move_to_end(owner)
+                while len(self._prefetched) > self.MAX_PREFETCHED:
+                    self._prefetched.popitem(last=False)  # Precargas que nadie consumió
+        except Exception as e:
+            self.logger.warning(f"No se pudo precargar la agenda: {e}")
+    
+    def _take_prefetched(self):
+        """Entrega el snapshot precargado para este hilo si sigue vigente; si no, lee de disco"""
+        with self._prefetch_lock:
+            prefetched = self._prefetched.pop(threading.get_ident(), None)
+        if prefetched is not None and prefetched[0] == self._file_signature():
+            return prefetched[1], prefetched[2]
+        return self._read_dataframe(), {}
+    
     def _load_dataframe(self) -> pd.DataFrame:
-        """Carga el DataFrame desde Excel"""
+        """Carga el DataFrame (desde el snapshot de la unidad de trabajo si hay una activa)"""
+        if self._in_unit_of_work():
+            if self._uow.df is None:
+                # Firma antes de leer: si el archivo cambia entretanto, el commit lo detecta
+                self._uow.signature = self._file_signature()
+                self._uow.df, self._uow.dates = self._take_prefetched()
+            if self._uow.pending:
+                # Bloques agregados con save_many: una sola concatenación
+                frames = [frame for frame in [self._uow.df] + self._uow.pending if len(frame)]
+                self._uow.df = pd.concat(frames, ignore_index=True) if frames else self._uow.df
+                self._uow.pending = []
+            return self._uow.df
+        return self._take_prefetched()[0]
+    
+    def _read_dataframe(self) -> pd.DataFrame:
+        """Lee el DataFrame desde el snapshot columnar o, si no está vigente, desde Excel"""
         try:
-            return pd.read_excel(self.file_path)
+            signature = self._file_signature()
+            hot = self._hot
+            if hot is not None and signature is not None and hot[0] == signature:
+                # Copia superficial: quien la recibe puede modificarla sin tocar la caché
+                return hot[1].copy()
+            
+            df = None
+            if self.use_snapshot and signature is not None:
+                df = self._read_snapshot(signature)
+            if df is None:
+                df = pd.read_excel(self.file_path)
+                if self.use_snapshot:
+                    self._write_snapshot(df, signature)
+            df = self._normalize_columns(df)
+            self._remember(df, signature)
+            return df
         except PermissionError as e:
             self.logger.error(f"Sin permisos para acceder al archivo: {e}")
             raise
@@ -30,10 +336,89 @@ class ExcelAgendaAdapter(AgendaRepositoryPort):
             self.logger.error(f"Error al cargar archivo Excel: {e}")
             raise
     
+    def _remember(self, df: pd.DataFrame, signature: Optional[str]):
+        """Conserva una copia del DataFrame ligada a la firma del Excel"""
+        if self.keep_in_memory and signature is not None:
+            self._hot = (signature, df.copy())
+    
+    def _normalize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Agrega la columna de recurrencia a agendas creadas antes de existir"""
+        if 'Recurrencia' not in df.columns:
+            df['Recurrencia'] = None
+        return df
+    
+    @staticmethod
+    def _recurrence_mask(df: pd.DataFrame) -> pd.Series:
+        """Filas que almacenan una regla de recurrencia en lugar de un evento único"""
+        return df['Recurrencia'].fillna('').astype(str).str.strip() != ''
+    
+    @staticmethod
+    def _row_to_event(row) -> AgendaEvent:
+        """Convierte una fila en la entidad correspondiente (única o recurrente)"""
+        if isinstance(row['Recurrencia'], str) and row['Recurrencia'].strip():
+            return RecurringEvent.from_dict(row)
+        return AgendaEvent.from_dict(row)
+    
+    def _iter_events(self, df: pd.DataFrame) -> Iterator[AgendaEvent]:
+        """Convierte las filas en entidades (con registros planos, más rápido que iterrows)"""
+        for record in df[self.COLUMNS].to_dict('records'):
+            yield self._row_to_event(record)
+    
+    def _build_name_index(self, df: pd.DataFrame) -> EventNameIndex:
+        """Índice de nombres del DataFrame (las filas no convertibles se omiten)"""
+        return EventNameIndex.from_rows(df[self.COLUMNS].to_dict('records'), self._row_to_event)
+    
+    def _get_name_index(self) -> EventNameIndex:
+        """Devuelve el índice de nombres, reconstruyéndolo solo si el Excel cambió"""
+        if self._in_unit_of_work() and self._uow.dirty:
+            # Cambios aún no confirmados: indexar el snapshot en búfer
+            if self._uow.name_index is None:
+                self._uow.name_index = self._build_name_index(self._load_dataframe())
+            return self._uow.name_index
+        
+        signature = self._file_signature()
+        cached = self._name_index
+        if cached is None or cached[0] != signature:
+            cached = (signature, self._build_name_index(self._load_dataframe()))
+            self._name_index = cached
+        return cached[1]
+    
     def _save_dataframe(self, df: pd.DataFrame):
-        """Guarda el DataFrame en Excel"""
+        """Guarda el DataFrame (en búfer hasta el cierre si hay una unidad de trabajo activa)"""
+        if self._in_unit_of_work():
+            # Reindexar para que los agregados con loc[len(df)] no pisen filas
+            self._uow.df = df.reset_index(drop=True)
+            self._uow.dirty = True
+            self._uow.name_index = None
+            self._uow.dates = {}
+            return
+        self._write_dataframe(df)
+    
+    def _replace_file(self, tmp_path: str):
+        """Sustituye el Excel por el temporal; si el archivo está montado como volumen, lo copia encima"""
         try:
-            df.to_excel(self.file_path, index=False)
+            os.replace(tmp_path, self.file_path)
+        except OSError as e:
+            if e.errno not in (errno.EBUSY, errno.EXDEV):
+                raise
+            # Ej: docker-compose monta agenda.xlsx como archivo suelto y no admite reemplazarlo
+            self.logger.warning(f"No se puede reemplazar {self.file_path} de forma atómica, se copia: {e}")
+            shutil.copyfile(tmp_path, self.file_path)
+    
+    def _write_dataframe(self, df: pd.DataFrame):
+        """Escribe el DataFrame en Excel (archivo temporal y reemplazo atómico)"""
+        # Las lecturas sin bloqueo (ej: precargas) nunca ven un libro a medio escribir
+        base, extension = os.path.splitext(self.file_path)
+        tmp_path = f"{base}.{os.getpid()}.{threading.get_ident()}.tmp{extension}"
+        try:
+            df.to_excel(tmp_path, index=False)
+            self._replace_file(tmp_path)
+            signature = self._file_signature()
+            if self.use_snapshot:
+                self._write_snapshot(df, signature)
+            self._remember(df, signature)
+            # El archivo ya está escrito: el índice se reconstruye en la siguiente búsqueda
+            self._name_index = None
         except PermissionError as e:
             self.logger.error(f"Sin permisos para escribir archivo: {e}")
             raise
@@ -43,14 +428,18 @@ class ExcelAgendaAdapter(AgendaRepositoryPort):
         except Exception as e:
             self.logger.error(f"Error inesperado al guardar Excel: {e}")
             raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
     def save(self, event: AgendaEvent) -> bool:
         """Implementa el puerto: guardar evento"""
         try:
-            df = self._load_dataframe()
-            # Usar loc para mejor rendimiento
-            df.loc[len(df)] = event.to_dict()
-            self._save_dataframe(df)
+            with self._writing():
+                df = self._load_dataframe()
+                # Usar loc para mejor rendimiento
+                df.loc[len(df)] = event.to_dict()
+                self._save_dataframe(df)
             return True
         except (FileNotFoundError, PermissionError) as e:
             self.logger.error(f"Error de archivo: {e}")
@@ -59,12 +448,74 @@ class ExcelAgendaAdapter(AgendaRepositoryPort):
             self.logger.error(f"Error inesperado al guardar: {e}")
             return False
     
+    def save_many(self, events: List[AgendaEvent]) -> int:
+        """Implementa el puerto: guardar varios eventos con una sola escritura"""
+        if not events:
+            return 0
+        try:
+            new_rows = pd.DataFrame([event.to_dict() for event in events], columns=self.COLUMNS)
+            with self._writing():
+                # En búfer: evita copiar el DataFrame acumulado en cada bloque
+                self._uow.pending.append(new_rows)
+                self._uow.dirty = True
+                self._uow.name_index = None
+                self._uow.dates = {}
+            return len(events)
+        except (FileNotFoundError, PermissionError) as e:
+            self.logger.error(f"Error de archivo al guardar en bloque: {e}")
+            return 0
+        except Exception as e:
+            self.logger.error(f"Error inesperado al guardar en bloque: {e}")
+            return 0
+    
+    def _events_on_date(self, df: pd.DataFrame, fecha: str) -> List[AgendaEvent]:
+        """Eventos únicos de la fecha más las ocurrencias de las reglas recurrentes"""
+        is_recurring = self._recurrence_mask(df)
+        filtered_df = df[(df['Fecha'] == fecha) & ~is_recurring]
+        events = [AgendaEvent.from_dict(row) for _, row in filtered_df.iterrows()]
+        
+        # Las reglas se expanden solo para la fecha consultada
+        rules_df = df[is_recurring & (df['Fecha'] <= fecha)]
+        for _, row in rules_df.iterrows():
+            events.extend(RecurringEvent.from_dict(row).occurrences(fecha, fecha))
+        return events
+    
+    def _archived_events(self, fecha: str) -> List[AgendaEvent]:
+        """Eventos del almacén frío; solo se consulta si el índice tiene esa fecha"""
+        if self.archive is None or not self.archive.has_date(fecha):
+            return []
+        return [AgendaEvent.from_dict(row) for row in self.archive.find_by_date(fecha)]
+    
+    def archive_before(self, fecha_limite: str) -> int:
+        """Implementa el puerto: mueve al archivo los eventos únicos anteriores a la fecha límite"""
+        if self.archive is None:
+            return 0
+        try:
+            with self._writing():
+                df = self._load_dataframe()
+                is_past = (df['Fecha'].astype(str) < fecha_limite) & ~self._recurrence_mask(df)
+                if not is_past.any():
+                    return 0
+                # Primero el archivo frío: si falla la escritura del Excel, no se pierde nada
+                archived = self.archive.append(df[is_past])
+                self._save_dataframe(df[~is_past])
+            return archived
+        except (FileNotFoundError, PermissionError) as e:
+            self.logger.error(f"Error de archivo al archivar: {e}")
+            return 0
+        except Exception as e:
+            self.logger.error(f"Error inesperado al archivar: {e}")
+            return 0
+    
     def find_by_date(self, fecha: str) -> List[AgendaEvent]:
         """Implementa el puerto: buscar por fecha"""
         try:
             df = self._load_dataframe()
-            filtered_df = df[df['Fecha'] == fecha]
-            return [AgendaEvent.from_dict(row) for _, row in filtered_df.iterrows()]
+            if self._in_unit_of_work() and fecha in self._uow.dates:
+                events = list(self._uow.dates[fecha])  # Precargado durante la llamada al LLM
+            else:
+                events = self._events_on_date(df, fecha)
+            return events + self._archived_events(fecha)
         except (FileNotFoundError, KeyError) as e:
             self.logger.error(f"Error al buscar por fecha: {e}")
             return []
@@ -76,7 +527,7 @@ class ExcelAgendaAdapter(AgendaRepositoryPort):
         """Implementa el puerto: buscar todos"""
         try:
             df = self._load_dataframe()
-            return [AgendaEvent.from_dict(row) for _, row in df.iterrows()]
+            return list(self._iter_events(df))
         except (FileNotFoundError, KeyError) as e:
             self.logger.error(f"Error al buscar todos los eventos: {e}")
             return []
@@ -84,17 +535,66 @@ class ExcelAgendaAdapter(AgendaRepositoryPort):
             self.logger.error(f"Error inesperado al obtener eventos: {e}")
             return []
     
+    def search_by_name(self, texto: str, fecha: Optional[str] = None, limit: int = 10) -> List[AgendaEvent]:
+        """Implementa el puerto: buscar por nombre aproximado usando el índice de trigramas"""
+        try:
+            def occurs_on_date(event: AgendaEvent) -> Optional[AgendaEvent]:
+                if isinstance(event, RecurringEvent):
+                    return next(event.occurrences(fecha, fecha), None)
+                return event if event.fecha == fecha else None
+            
+            predicate = occurs_on_date if fecha else None
+            results = self._get_name_index().search(texto, limit=limit, predicate=predicate)
+            
+            if fecha:
+                # Fecha archivada: indexar al vuelo sus pocos eventos
+                archived = self._archived_events(fecha)
+                archived_results = EventNameIndex(archived).search(texto, limit=limit) if archived else []
+            else:
+                archived_results = self.archive.search(texto, limit=limit) if self.archive is not None else []
+            if archived_results:
+                # Mezclar por puntuación (orden estable: a igualdad, primero los activos)
+                results = sorted(results + archived_results, key=lambda item: -item[0])[:limit]
+            return [event for _, event in results]
+        except (FileNotFoundError, KeyError) as e:
+            self.logger.error(f"Error al buscar por nombre: {e}")
+            return []
+        except Exception as e:
+            self.logger.error(f"Error inesperado en búsqueda por nombre: {e}")
+            return []
+    
     def delete(self, evento: str, fecha: str) -> bool:
         """Implementa el puerto: eliminar evento"""
         try:
-            df = self._load_dataframe()
-            initial_count = len(df)
-            df = df[~((df['Evento'] == evento) & (df['Fecha'] == fecha))]
-            
-            if len(df) < initial_count:
-                self._save_dataframe(df)
-                return True
-            return False
+            with self._writing():
+                df = self._load_dataframe()
+                initial_count = len(df)
+                is_recurring = self._recurrence_mask(df)
+                df = df[~((df['Evento'] == evento) & (df['Fecha'] == fecha) & ~is_recurring)]
+                
+                if len(df) < initial_count:
+                    self._save_dataframe(df)
+                    return True
+                
+                # Sin evento único: excluir esa ocurrencia de la serie recurrente (no la serie entera)
+                series_df = df[self._recurrence_mask(df) & (df['Evento'] == evento) & (df['Fecha'] <= fecha)]
+                for index, row in series_df.iterrows():
+                    series = RecurringEvent.from_dict(row)
+                    if next(series.occurrences(fecha, fecha), None) is None:
+                        continue
+                    remaining = series.without_occurrence(fecha)
+                    if remaining is None:
+                        df = df.drop(index=index)  # Era su última ocurrencia
+                    else:
+                        df = df.copy()
+                        df.loc[index, 'Recurrencia'] = remaining.regla.to_string()
+                    self._save_dataframe(df)
+                    return True
+                # Fechas pasadas: el evento puede estar en el archivo frío (se borra al confirmar)
+                if any(event.evento == evento for event in self._archived_events(fecha)):
+                    self._after_commit(lambda: self.archive.delete(evento, fecha))
+                    return True
+                return False
         except (FileNotFoundError, PermissionError) as e:
             self.logger.error(f"Error de archivo al eliminar: {e}")
             return False
@@ -103,17 +603,21 @@ class ExcelAgendaAdapter(AgendaRepositoryPort):
             return False
     
     def delete_all(self) -> bool:
-        """Implementa el puerto: eliminar todos los eventos"""
+        """Implementa el puerto: eliminar todos los eventos (activos y archivados)"""
         try:
-            df = self._load_dataframe()
-            initial_count = len(df)
-            
-            if initial_count == 0:
-                return False  # No hay eventos para eliminar
-            
-            # Crear DataFrame vacío con las mismas columnas
-            empty_df = pd.DataFrame(columns=['Evento', 'Fecha', 'Hora'])
-            self._save_dataframe(empty_df)
+            with self._writing():
+                df = self._load_dataframe()
+                archived = self.count_archived()
+                
+                if len(df) == 0 and not archived:
+                    return False  # No hay eventos para eliminar
+                
+                # El archivo frío se vacía solo después de confirmar la escritura del Excel
+                if archived:
+                    self._after_commit(self.archive.clear)
+                if len(df):
+                    # Crear DataFrame vacío con las mismas columnas
+                    self._save_dataframe(pd.DataFrame(columns=self.COLUMNS))
             return True
             
         except (FileNotFoundError, PermissionError) as e:
@@ -123,6 +627,10 @@ class ExcelAgendaAdapter(AgendaRepositoryPort):
             self.logger.error(f"Error inesperado al eliminar todos: {e}")
             return False
     
+    def count_archived(self) -> int:
+        """Implementa el puerto: número de eventos en el archivo frío"""
+        return self.archive.count() if self.archive is not None else 0
+    
     def export_to_excel(self, export_path: str) -> bool:
         """Exporta la agenda a un archivo Excel específico"""
         try:
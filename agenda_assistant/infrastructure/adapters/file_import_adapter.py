@@ -0,0 +1,136 @@
+import pandas as pd
+import os
+import re
+import logging
+from typing import Dict, Iterator, List
+from ..ports.event_source_port import EventSourcePort, ImportChunk
+from ...domain.entities import AgendaEvent
+
+
+class FileEventSourceAdapter(EventSourcePort):
+    """Adaptador de salida - Lectura por bloques de archivos CSV e iCalendar (.ics)"""
+
+    REQUIRED_COLUMNS = ['Evento', 'Fecha', 'Hora']
+    TIME_PATTERN = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
+    ICS_DATETIME = re.compile(r'^(\d{4})(\d{2})(\d{2})(?:T(\d{2})(\d{2})\d{0,2}Z?)?$')
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def read_chunks(self, path: str, chunk_size: int = 5000) -> Iterator[ImportChunk]:
+        """Implementa el puerto: leer y validar por bloques según la extensión"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No existe el archivo: {path}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size debe ser mayor que cero")
+
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            frames = self._read_csv(path, chunk_size)
+        elif extension in ('.ics', '.ical'):
+            frames = self._read_ics(path, chunk_size)
+        else:
+            raise ValueError(f"Formato no soportado: {extension}. Use .csv o .ics")
+
+        for frame in frames:
+            yield self._validate_chunk(frame)
+
+    def _read_csv(self, path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Lee el CSV por bloques; la columna 'Fila' conserva la posición original"""
+        row_offset = 1
+        for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False,
+                                 skipinitialspace=True):
+            # Aceptar encabezados sin importar mayúsculas o espacios
+            chunk = chunk.rename(columns={c: str(c).strip().capitalize() for c in chunk.columns})
+            missing = [c for c in self.REQUIRED_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"Columnas requeridas faltantes: {', '.join(missing)}")
+
+            chunk = chunk[self.REQUIRED_COLUMNS].copy()
+            chunk['Fila'] = range(row_offset, row_offset + len(chunk))
+            row_offset += len(chunk)
+            yield chunk
+
+    def _read_ics(self, path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Lee los VEVENT de un iCalendar línea a línea y los agrupa en bloques"""
+        rows: List[Dict[str, object]] = []
+        for row in self._iter_vevents(path):
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield pd.DataFrame(rows, columns=self.REQUIRED_COLUMNS + ['Fila'])
+                rows = []
+        if rows:
+            yield pd.DataFrame(rows, columns=self.REQUIRED_COLUMNS + ['Fila'])
+
+    def _iter_vevents(self, path: str) -> Iterator[Dict[str, object]]:
+        """Genera un registro por VEVENT (SUMMARY y DTSTART) con las líneas desplegadas"""
+        event_number = 0
+        current = None
+
+        for line in self._iter_unfolded_lines(path):
+            name, _, value = line.partition(':')
+            key = name.split(';', 1)[0].upper()
+
+            if key == 'BEGIN' and value.upper() == 'VEVENT':
+                event_number += 1
+                current = {'Evento': '', 'Fecha': '', 'Hora': '', 'Fila': event_number}
+            elif key == 'END' and value.upper() == 'VEVENT' and current is not None:
+                yield current
+                current = None
+            elif current is not None and key == 'SUMMARY':
+                current['Evento'] = value.replace('\\,', ',').replace('\\;', ';').replace('\\n', ' ')
+            elif current is not None and key == 'DTSTART':
+                # Se conserva la hora tal como viene escrita (sin conversión de zona horaria)
+                match = self.ICS_DATETIME.match(value.strip())
+                if match:
+                    year, month, day, hour, minute = match.groups()
+                    current['Fecha'] = f"{year}-{month}-{day}"
+                    current['Hora'] = f"{hour}:{minute}" if hour else ''
+                else:
+                    current['Fecha'] = value.strip()
+
+    @staticmethod
+    def _iter_unfolded_lines(path: str) -> Iterator[str]:
+        """Une las líneas plegadas (RFC 5545: continúan con espacio o tabulador)"""
+        pending = None
+        with open(path, encoding='utf-8') as handle:
+            for raw in handle:
+                line = raw.rstrip('\r\n')
+                if line[:1] in (' ', '\t') and pending is not None:
+                    pending += line[1:]
+                    continue
+                if pending is not None:
+                    yield pending
+                pending = line
+        if pending is not None:
+            yield pending
+
+    def _validate_chunk(self, df: pd.DataFrame) -> ImportChunk:
+        """Valida Evento, Fecha y Hora por columnas y separa aceptados de rechazados"""
+        evento = df['Evento'].astype(str).str.strip()
+        fecha_raw = df['Fecha'].astype(str).str.strip()
+        hora_raw = df['Hora'].astype(str).str.strip()
+
+        fecha = pd.to_datetime(fecha_raw, format='%Y-%m-%d', errors='coerce')
+        hora_ok = hora_raw.str.match(self.TIME_PATTERN)
+
+        reasons = pd.Series('', index=df.index)
+        reasons = reasons.mask(evento == '', reasons + 'evento vacío; ')
+        reasons = reasons.mask(fecha.isna(), reasons + 'fecha inválida (' + fecha_raw + '); ')
+        reasons = reasons.mask(~hora_ok, reasons + 'hora inválida (' + hora_raw + '); ')
+
+        is_valid = reasons == ''
+        accepted = pd.DataFrame({
+            'Evento': evento[is_valid],
+            'Fecha': fecha[is_valid].dt.strftime('%Y-%m-%d'),
+            'Hora': hora_raw[is_valid].str.zfill(5),
+        })
+        rejected = df.loc[~is_valid, 'Fila'].astype(int).tolist()
+
+        return ImportChunk(
+            events=[
+                AgendaEvent(evento_, fecha_, hora_)
+                for evento_, fecha_, hora_ in accepted.itertuples(index=False, name=None)
+            ],
+            rejected=list(zip(rejected, reasons[~is_valid].str.rstrip('; ').tolist()))
+        )
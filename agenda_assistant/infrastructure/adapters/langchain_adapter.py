@@ -2,13 +2,22 @@
 from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from ..ports.service_ports import AIAgentPort, AgendaServicePort
+from ..profiling import in_current_turn
+import html
+import logging
 import re
-from datetime import datetime
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
 
 
 class LangChainAgentAdapter(AIAgentPort):
     """Adaptador LangChain que respeta los principios hexagonales."""
     
+    _prefetch_executor = None
+    _prefetch_executor_lock = threading.Lock()
+    
     # Template de prompt como constante de clase
     PROMPT_TEMPLATE = """
 Eres un asistente de agenda inteligente de {company_name}.
@@ -23,10 +32,14 @@ Si ya conoces al usuario, analiza su consulta y determina qué acción realizar:
 1. Para crear eventos: "AGREGAR|descripcion_evento|YYYY-MM-DD|HH:MM"
 2. Para consultar fecha específica: "CONSULTAR|YYYY-MM-DD"
 3. Para ver todos los eventos: "LISTAR"
-4. Para eliminar evento específico: "ELIMINAR|nombre_evento|YYYY-MM-DD"
+4. Para eliminar evento específico: "ELIMINAR|nombre_evento|YYYY-MM-DD" (o "ELIMINAR|nombre_evento" si no indica fecha)
 5. Para eliminar TODOS los eventos: "ELIMINAR_TODOS"
 6. Para exportar agenda: "EXPORTAR|ruta_opcional"
 7. Para solicitar información: "INFO|mensaje_al_usuario"
+8. Para crear eventos recurrentes: "RECURRENTE|descripcion_evento|YYYY-MM-DD|HH:MM|FRECUENCIA|fin_opcional"
+   (FRECUENCIA: DIARIA, SEMANAL o MENSUAL; fin_opcional: fecha límite YYYY-MM-DD o número de repeticiones)
+9. Para buscar eventos por nombre en cualquier fecha: "BUSCAR|texto"
+10. Para importar eventos desde un archivo CSV o iCalendar: "IMPORTAR|ruta_archivo"
 
 IMPORTANTE: Si el usuario dice solo "eliminar" sin especificar qué evento o fecha, responde: INFO|¿Qué evento quieres eliminar? Por favor especifica el nombre del evento y la fecha.
 
@@ -41,6 +54,11 @@ Ejemplos de interpretación:
 - "exportar agenda" → EXPORTAR
 - "descargar agenda" → EXPORTAR
 - "guardar agenda como" → EXPORTAR|ruta
+- "reunión de equipo todos los lunes a las 9 hasta junio" → RECURRENTE|reunión de equipo|2024-01-22|09:00|SEMANAL|2024-06-30
+- "yoga diario a las 7 durante 10 días" → RECURRENTE|yoga|2024-01-16|07:00|DIARIA|10
+- "buscar la cita con el dentista" → BUSCAR|cita dentista
+- "eliminar la reunión con Ana" → ELIMINAR|reunión con Ana
+- "importar eventos de equipo.csv" → IMPORTAR|equipo.csv
 
 Calcula fechas relativas basado en {current_date}:
 - "hoy" = {current_date}
@@ -52,21 +70,18 @@ Consulta del usuario: {query}
 Responde SOLO con el formato de acción correspondiente:
 """
 
-    def __init__(self, agenda_service: AgendaServicePort, api_key: str, company_name: str = "Tu Empresa"):
+    def __init__(self, agenda_service: AgendaServicePort, api_key: str, company_name: str = "Tu Empresa",
+                 llm=None):
         if not agenda_service:
             raise ValueError("agenda_service no puede ser None")
-        if not api_key:
+        if llm is None and not api_key:
             raise ValueError("GEMINI_API_KEY es obligatoria")
         
         self.agenda_service = agenda_service
         self.company_name = company_name
         
-        # Configurar LLM con LangChain
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=api_key,
-            temperature=0
-        )
+        # Configurar LLM con LangChain (o usar uno inyectado, compartido entre agentes)
+        self.llm = llm if llm is not None else self.create_llm(api_key)
         
         # Prompt template usando constante de clase
         self.prompt = PromptTemplate(
@@ -78,7 +93,72 @@ Responde SOLO con el formato de acción correspondiente:
         self.conversation_history = []
         self.user_name = None
         self.pending_deletion = None  # Para almacenar eliminación pendiente
+        self.last_command = None  # Tipo de acción del último turno (para perfilado)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def create_llm(api_key: str) -> ChatGoogleGenerativeAI:
+        """Crea el cliente LLM de Gemini configurado para el agente."""
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY es obligatoria")
+        return ChatGoogleGenerativeAI(
+            model="gemini-2.5-flash",
+            google_api_key=api_key,
+            temperature=0
+        )
 
+    @classmethod
+    def _get_prefetch_executor(cls) -> ThreadPoolExecutor:
+        """Pool compartido por todos los agentes para precargar el repositorio"""
+        with cls._prefetch_executor_lock:
+            if cls._prefetch_executor is None:
+                cls._prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+            return cls._prefetch_executor
+    
+    @staticmethod
+    def _extract_date(query: str, current_date: str) -> Optional[str]:
+        """Fecha explícita (YYYY-MM-DD) o relativa (hoy, mañana, pasado mañana) de la consulta"""
+        match = re.search(r'\b\d{4}-\d{2}-\d{2}\b', query)
+        if match:
+            return match.group(0)
+        
+        query_lower = query.lower()
+        offset = None
+        if "pasado mañana" in query_lower:
+            offset = 2
+        elif "mañana" in query_lower:
+            offset = 1
+        elif "hoy" in query_lower:
+            offset = 0
+        if offset is None:
+            return None
+        return (datetime.fromisoformat(current_date) + timedelta(days=offset)).strftime("%Y-%m-%d")
+    
+    def _start_prefetch(self, query: str, current_date: str) -> Optional[Future]:
+        """Precarga la agenda en segundo plano mientras el LLM procesa la consulta"""
+        try:
+            fecha = self._extract_date(query, current_date)
+            # Corre en el pool, pero la consume este hilo al ejecutar la acción
+            return self._get_prefetch_executor().submit(
+                in_current_turn(self.agenda_service.prefetch), fecha, threading.get_ident()
+            )
+        except Exception as e:
+            self.logger.warning(f"No se pudo iniciar la precarga: {e}")
+            return None
+    
+    def _wait_prefetch(self, prefetch: Optional[Future]) -> None:
+        """Espera a que termine la precarga para no leer el repositorio dos veces"""
+        if prefetch is None:
+            return
+        if prefetch.cancel():
+            # Seguía en cola detrás de precargas de otras sesiones: leer directamente es más rápido
+            return
+        try:
+            # Ya está en curso: esperarla no cuesta más que volver a leer de disco
+            prefetch.result()
+        except Exception as e:
+            self.logger.warning(f"Precarga no disponible, se leerá de disco: {e!r}")
+    
     def _validate_date(self, fecha: str) -> bool:
         """Valida formato de fecha."""
         try:
@@ -98,9 +178,11 @@ Responde SOLO con el formato de acción correspondiente:
         try:
             parts = action.strip().split('|')
             command = parts[0].upper()
+            self.last_command = command
             
             # Verificar si hay una eliminación pendiente de confirmación
             if self.pending_deletion:
+                self.last_command = "CONFIRMACION"
                 if command in ["SI", "SÍ", "YES", "CONFIRMAR"] or "sí" in action.lower() or "si" in action.lower():
                     # Ejecutar eliminación pendiente
                     pending = self.pending_deletion
@@ -141,6 +223,20 @@ Responde SOLO con el formato de acción correspondiente:
                 result = self.agenda_service.create_event(evento.strip(), fecha, hora)
                 return f"{self.user_name}, {result}"
             
+            elif command == "RECURRENTE" and len(parts) in (5, 6):
+                _, evento, fecha, hora, frecuencia = parts[:5]
+                fin = parts[5].strip() if len(parts) == 6 else ""
+                if not evento.strip():
+                    return f"{self.user_name}, el nombre del evento no puede estar vacío"
+                if not self._validate_date(fecha):
+                    return f"{self.user_name}, la fecha '{fecha}' no es válida. Usa formato YYYY-MM-DD"
+                if not self._validate_time(hora):
+                    return f"{self.user_name}, la hora '{hora}' no es válida. Usa formato HH:MM"
+                result = self.agenda_service.create_recurring_event(
+                    evento.strip(), fecha, hora, frecuencia.strip(), fin
+                )
+                return f"{self.user_name}, {result}"
+            
             elif command == "CONSULTAR" and len(parts) == 2:
                 _, fecha = parts
                 if not self._validate_date(fecha):
@@ -148,23 +244,32 @@ Responde SOLO con el formato de acción correspondiente:
                 result = self.agenda_service.get_events_by_date(fecha)
                 return f"{self.user_name}, {result}"
             
-            elif command == "ELIMINAR" and len(parts) == 3:
-                _, evento, fecha = parts
+            elif command == "ELIMINAR" and len(parts) in (2, 3):
+                evento = parts[1]
+                fecha = parts[2].strip() if len(parts) == 3 else None
                 if not evento.strip():
                     return f"{self.user_name}, el nombre del evento no puede estar vacío"
-                if not self._validate_date(fecha):
+                if fecha and not self._validate_date(fecha):
                     return f"{self.user_name}, la fecha '{fecha}' no es válida. Usa formato YYYY-MM-DD"
                 
-                # Verificar si el evento existe antes de pedir confirmación
-                events = self.agenda_service._repository.find_by_date(fecha)
-                event_exists = any(e.evento.lower() == evento.strip().lower() for e in events)
+                # Resolver el evento más parecido antes de pedir confirmación
+                match = self.agenda_service.find_matching_event(evento.strip(), fecha)
                 
-                if not event_exists:
-                    return f"{self.user_name}, no se encontró el evento '{evento.strip()}' en la fecha {fecha}"
+                if match is None:
+                    donde = f"en la fecha {fecha}" if fecha else "en la agenda"
+                    return f"{self.user_name}, no se encontró el evento '{evento.strip()}' {donde}"
                 
-                # Guardar eliminación pendiente y pedir confirmación
-                self.pending_deletion = {"type": "single", "evento": evento.strip(), "fecha": fecha}
-                return f"{self.user_name}, ¿estás seguro de que quieres eliminar el evento '{evento.strip()}' del {fecha}? Responde 'sí' para confirmar o 'no' para cancelar."
+                # Guardar eliminación pendiente con el nombre almacenado y pedir confirmación
+                fecha = fecha or match.fecha
+                self.pending_deletion = {"type": "single", "evento": html.unescape(match.evento), "fecha": fecha}
+                return f"{self.user_name}, ¿estás seguro de que quieres eliminar el evento '{match.evento}' del {fecha}? Responde 'sí' para confirmar o 'no' para cancelar."
+            
+            elif command == "BUSCAR" and len(parts) == 2:
+                _, texto = parts
+                if not texto.strip():
+                    return f"{self.user_name}, indica qué evento quieres buscar"
+                result = self.agenda_service.search_events(texto.strip())
+                return f"{self.user_name}, {result}"
             
             elif command == "LISTAR":
                 result = self.agenda_service.get_all_events()
@@ -172,9 +277,7 @@ Responde SOLO con el formato de acción correspondiente:
             
             elif command == "ELIMINAR_TODOS":
                 # Verificar si hay eventos antes de pedir confirmación
-                events = self.agenda_service._repository.find_all()
-                
-                if not events:
+                if not self.agenda_service.has_events():
                     return f"{self.user_name}, no hay eventos para eliminar"
                 
                 # Guardar eliminación pendiente y pedir confirmación
@@ -188,12 +291,19 @@ Responde SOLO con el formato de acción correspondiente:
                 result = self.agenda_service.export_agenda(export_path)
                 return f"{self.user_name}, {result}"
             
+            elif command == "IMPORTAR" and len(parts) == 2:
+                _, import_path = parts
+                if not import_path.strip():
+                    return f"{self.user_name}, indica la ruta del archivo CSV o .ics a importar"
+                result = self.agenda_service.import_events(import_path.strip())
+                return f"{self.user_name}, {result}"
+            
             elif command == "INFO" and len(parts) == 2:
                 _, mensaje = parts
                 return f"{self.user_name}, {mensaje.strip()}"
             
             else:
-                return f"¡Hola {self.user_name}! Puedo ayudarte con tu agenda. Ejemplos:\n- 'Agregar reunión mañana 10:30'\n- '¿Qué tengo el 2024-01-15?'\n- 'Eliminar reunión'\n- 'Eliminar todos los eventos'\n- 'Exportar agenda'"
+                return f"¡Hola {self.user_name}! Puedo ayudarte con tu agenda. Ejemplos:\n- 'Agregar reunión mañana 10:30'\n- 'Reunión de equipo todos los lunes a las 9'\n- '¿Qué tengo el 2024-01-15?'\n- 'Eliminar reunión'\n- 'Eliminar todos los eventos'\n- 'Exportar agenda'"
                 
         except Exception as e:
             user_prefix = f"{self.user_name}, " if self.user_name else ""
@@ -202,6 +312,8 @@ Responde SOLO con el formato de acción correspondiente:
     def process_natural_language(self, query: str) -> str:
         """Implementa el puerto AIAgentPort usando LangChain."""
         try:
+            self.last_command = "NOMBRE"
+            
             # Detectar si el usuario dice su nombre directamente
             query_lower = query.lower().strip()
             
@@ -256,12 +368,17 @@ Responde SOLO con el formato de acción correspondiente:
                     company_name=self.company_name
                 )
                 
+                # Precargar el repositorio mientras el LLM responde
+                prefetch = self._start_prefetch(query, current_date)
+                
                 # Invocar LLM con LangChain
                 result = self.llm.invoke(formatted_prompt)
                 action = result.content.strip()
+                self._wait_prefetch(prefetch)
                 
-                # Ejecutar acción
-                response = self._execute_action(action)
+                # Ejecutar acción sobre un único snapshot y confirmar en una sola escritura
+                with self.agenda_service.unit_of_work():
+                    response = self._execute_action(action)
             else:
                 # Si no tenemos nombre, pedirlo
                 response = f"¡Hola! Soy tu asistente de agenda de {self.company_name}. Antes de ayudarte, ¿podrías decirme tu nombre?"
@@ -0,0 +1,34 @@
+"""LLM sin conexión para ejecuciones por lotes y pruebas offline."""
+import re
+import time
+from langchain_core.messages import AIMessage
+
+
+class OfflineActionLLM:
+    """Sustituto determinista del LLM: devuelve la consulta si ya es una acción.
+
+    Permite procesar lotes sin acceso a Gemini cuando las consultas vienen
+    escritas en el formato de acciones (ej: "AGREGAR|reunión|2024-01-15|10:30").
+    """
+
+    QUERY_PATTERN = re.compile(r"Consulta del usuario:\s*(.*?)\s*Responde SOLO", re.DOTALL)
+    ACTIONS = (
+        "AGREGAR", "RECURRENTE", "CONSULTAR", "BUSCAR", "LISTAR", "ELIMINAR",
+        "ELIMINAR_TODOS", "EXPORTAR", "IMPORTAR", "INFO", "NOMBRE", "SI", "SÍ", "NO"
+    )
+
+    def __init__(self, latency_ms: float = 0.0):
+        # Latencia simulada para ensayar la concurrencia sin red
+        self.latency_ms = latency_ms
+
+    def invoke(self, prompt: str) -> AIMessage:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        match = self.QUERY_PATTERN.search(str(prompt))
+        query = match.group(1).strip() if match else str(prompt).strip()
+
+        command = query.split('|', 1)[0].strip().upper()
+        if command in self.ACTIONS:
+            return AIMessage(content=query)
+        return AIMessage(content=f"INFO|Modo sin conexión: no se pudo interpretar '{query}'")
@@ -0,0 +1,182 @@
+"""Protocolo binario compacto entre el servidor de repositorio y sus clientes.
+
+Cada trama lleva una cabecera fija (longitud del cuerpo, id de solicitud, código)
+seguida del valor codificado. Los ids permiten enviar varias solicitudes seguidas
+(pipelining) y emparejar después las respuestas.
+"""
+import socket
+import struct
+from typing import Any, Optional, Tuple
+from ...domain.entities import AgendaEvent, RecurringEvent
+
+# Cabecera: longitud del cuerpo (uint32), id de solicitud (uint32), operación o estado (uint8)
+HEADER = struct.Struct('!IIB')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Operaciones
+OP_PING = 1
+OP_SAVE = 2
+OP_SAVE_MANY = 3
+OP_FIND_BY_DATE = 4
+OP_FIND_ALL = 5
+OP_SEARCH_BY_NAME = 6
+OP_DELETE = 7
+OP_DELETE_ALL = 8
+OP_EXPORT_TO_EXCEL = 9
+OP_ARCHIVE_BEFORE = 10
+OP_PREFETCH = 11
+OP_BEGIN = 12
+OP_COMMIT = 13
+OP_ROLLBACK = 14
+OP_COUNT_ARCHIVED = 15
+
+# Estados de respuesta
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# Etiquetas de tipo del codificador
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _LIST, _DICT, _EVENT = b'NTFifslde'
+_INT64 = struct.Struct('!q')
+_FLOAT64 = struct.Struct('!d')
+_UINT32 = struct.Struct('!I')
+
+
+def encode_event(event: AgendaEvent) -> Tuple[str, str, str, Optional[str]]:
+    recurrencia = event.regla.to_string() if isinstance(event, RecurringEvent) else None
+    return event.evento, event.fecha, event.hora, recurrencia
+
+
+def decode_event(evento: str, fecha: str, hora: str, recurrencia: Optional[str]) -> AgendaEvent:
+    if recurrencia:
+        return RecurringEvent.from_dict({'Evento': evento, 'Fecha': fecha, 'Hora': hora, 'Recurrencia': recurrencia})
+    return AgendaEvent(evento, fecha, hora)
+
+
+def _encode_str(text: str, out: bytearray):
+    data = text.encode('utf-8')
+    out += _UINT32.pack(len(data))
+    out += data
+
+
+def _encode(value: Any, out: bytearray):
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        out += _INT64.pack(value)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        out.append(_STR)
+        _encode_str(value, out)
+    elif isinstance(value, AgendaEvent):
+        # Evento: cuatro cadenas seguidas (la recurrencia vacía indica evento único)
+        out.append(_EVENT)
+        for field in encode_event(value):
+            _encode_str(field or '', out)
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        out += _UINT32.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        out += _UINT32.pack(len(value))
+        for key, item in value.items():
+            _encode_str(str(key), out)
+            _encode(item, out)
+    else:
+        raise TypeError(f"Tipo no soportado por el protocolo: {type(value).__name__}")
+
+
+def encode(value: Any) -> bytes:
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def _decode_str(data: memoryview, pos: int) -> Tuple[str, int]:
+    (length,) = _UINT32.unpack_from(data, pos)
+    pos += _UINT32.size
+    return bytes(data[pos:pos + length]).decode('utf-8'), pos + length
+
+
+def _decode(data: memoryview, pos: int) -> Tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _INT:
+        return _INT64.unpack_from(data, pos)[0], pos + _INT64.size
+    if tag == _FLOAT:
+        return _FLOAT64.unpack_from(data, pos)[0], pos + _FLOAT64.size
+    if tag == _STR:
+        return _decode_str(data, pos)
+    if tag == _EVENT:
+        fields = []
+        for _ in range(4):
+            text, pos = _decode_str(data, pos)
+            fields.append(text)
+        return decode_event(*fields), pos
+    if tag == _LIST:
+        (count,) = _UINT32.unpack_from(data, pos)
+        pos += _UINT32.size
+        items = []
+        for _ in range(count):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == _DICT:
+        (count,) = _UINT32.unpack_from(data, pos)
+        pos += _UINT32.size
+        result = {}
+        for _ in range(count):
+            key, pos = _decode_str(data, pos)
+            result[key], pos = _decode(data, pos)
+        return result, pos
+    raise ValueError(f"Etiqueta de tipo desconocida: {tag}")
+
+
+def decode(payload: bytes) -> Any:
+    if not payload:
+        return None
+    value, _ = _decode(memoryview(payload), 0)
+    return value
+
+
+def pack_frame(request_id: int, code: int, value: Any) -> bytes:
+    body = encode(value)
+    return HEADER.pack(len(body), request_id, code) + body
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = bytearray()
+    while len(chunks) < size:
+        chunk = sock.recv(size - len(chunks))
+        if not chunk:
+            return None
+        chunks += chunk
+    return bytes(chunks)
+
+
+def read_frame(sock: socket.socket) -> Optional[Tuple[int, int, Any]]:
+    """Lee una trama completa; devuelve None si el otro extremo cerró la conexión"""
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    length, request_id, code = HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Trama demasiado grande: {length} bytes")
+    body = _recv_exact(sock, length) if length else b''
+    if body is None:
+        return None
+    return request_id, code, decode(body)
@@ -0,0 +1,143 @@
+"""Servidor de repositorio: un único proceso propietario del almacenamiento.
+
+Las réplicas de la aplicación se conectan por un socket Unix y le delegan las
+operaciones del puerto de repositorio. El servidor mantiene la agenda y el índice
+de nombres en memoria y serializa todas las escrituras.
+"""
+import logging
+import os
+import socket
+import socketserver
+from typing import Any, Callable, Dict, List
+from ..ports.agenda_repository_port import AgendaRepositoryPort
+from . import repository_protocol as protocol
+
+
+class _Rollback(Exception):
+    """Señal interna para deshacer la unidad de trabajo abierta por un cliente"""
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    """Atiende una conexión en su propio hilo, respondiendo en el orden de llegada.
+
+    La unidad de trabajo del repositorio es por hilo, así que BEGIN/COMMIT de un
+    cliente delimitan una transacción que no se mezcla con las de otras conexiones.
+    """
+
+    def setup(self):
+        self.repository: AgendaRepositoryPort = self.server.repository
+        self.logger = logging.getLogger(__name__)
+        # Unidades de trabajo abiertas por el cliente (las anidadas actúan como savepoints)
+        self.open_units: List[Any] = []
+        self.operations: Dict[int, Callable[[Any], Any]] = {
+            protocol.OP_PING: lambda args: True,
+            protocol.OP_SAVE: lambda args: self._write(self.repository.save, args[0]),
+            protocol.OP_SAVE_MANY: lambda args: self._write(self.repository.save_many, args[0]),
+            protocol.OP_FIND_BY_DATE: lambda args: self.repository.find_by_date(args[0]),
+            protocol.OP_FIND_ALL: lambda args: self.repository.find_all(),
+            protocol.OP_SEARCH_BY_NAME: lambda args: self.repository.search_by_name(*args),
+            protocol.OP_DELETE: lambda args: self._write(self.repository.delete, *args),
+            protocol.OP_DELETE_ALL: lambda args: self._write(self.repository.delete_all),
+            protocol.OP_EXPORT_TO_EXCEL: lambda args: self.repository.export_to_excel(args[0]),
+            protocol.OP_ARCHIVE_BEFORE: lambda args: self._write(self.repository.archive_before, args[0]),
+            protocol.OP_COUNT_ARCHIVED: lambda args: self.repository.count_archived(),
+            protocol.OP_PREFETCH: lambda args: self.repository.prefetch(args[0]),
+            protocol.OP_BEGIN: lambda args: self._begin(),
+            protocol.OP_COMMIT: lambda args: self._finish(commit=True),
+            protocol.OP_ROLLBACK: lambda args: self._finish(commit=False),
+        }
+
+    def _write(self, operation: Callable, *args):
+        """Fuera de una transacción del cliente, cada escritura es su propia unidad de trabajo"""
+        if self.open_units:
+            return operation(*args)
+        with self.repository.unit_of_work():
+            return operation(*args)
+
+    def _begin(self) -> bool:
+        unit = self.repository.unit_of_work()
+        unit.__enter__()
+        self.open_units.append(unit)
+        return True
+
+    def _finish(self, commit: bool) -> bool:
+        if not self.open_units:
+            raise ValueError("No hay una unidad de trabajo abierta")
+        unit = self.open_units.pop()
+        if commit:
+            unit.__exit__(None, None, None)
+        else:
+            unit.__exit__(_Rollback, _Rollback(), None)
+        return True
+
+    def handle(self):
+        sock: socket.socket = self.request
+        try:
+            while True:
+                frame = protocol.read_frame(sock)
+                if frame is None:
+                    break
+                request_id, operation, args = frame
+                try:
+                    handler = self.operations.get(operation)
+                    if handler is None:
+                        raise ValueError(f"Operación desconocida: {operation}")
+                    response = protocol.pack_frame(request_id, protocol.STATUS_OK, handler(args or []))
+                except Exception as e:
+                    self.logger.error(f"Error al atender la operación {operation}: {e}")
+                    response = protocol.pack_frame(request_id, protocol.STATUS_ERROR, str(e))
+                sock.sendall(response)
+        except (ConnectionError, ValueError) as e:
+            self.logger.warning(f"Conexión de cliente interrumpida: {e}")
+
+    def finish(self):
+        # Un cliente que se desconecta a mitad de transacción no confirma nada
+        while self.open_units:
+            try:
+                self._finish(commit=False)
+            except Exception as e:
+                self.logger.error(f"Error al deshacer una unidad de trabajo abandonada: {e}")
+
+
+class AgendaRepositoryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Expone un AgendaRepositoryPort por socket Unix (un hilo por conexión)"""
+
+    daemon_threads = True
+
+    def __init__(self, repository: AgendaRepositoryPort, socket_path: str):
+        self.repository = repository
+        self.socket_path = socket_path
+        self.logger = logging.getLogger(__name__)
+        self._remove_stale_socket()
+        directory = os.path.dirname(socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(socket_path, _ConnectionHandler)
+
+    def _remove_stale_socket(self):
+        """Elimina el socket de una ejecución anterior, salvo que otro servidor lo esté usando"""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.remove(self.socket_path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"Ya hay un servidor de repositorio escuchando en {self.socket_path}")
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        self.logger.info(f"Servidor de repositorio escuchando en {self.socket_path}")
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
@@ -0,0 +1,293 @@
+import itertools
+import logging
+import socket
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from ..ports.agenda_repository_port import AgendaRepositoryPort
+from ...domain.entities import AgendaEvent
+from . import repository_protocol as protocol
+
+
+class _ServerConnection:
+    """Conexión con el servidor: envíos encadenados y un hilo lector que resuelve las respuestas"""
+
+    def __init__(self, socket_path: str, timeout: float):
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.closed = False
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_responses, name="agenda-repo-reader", daemon=True)
+        self._reader.start()
+
+    def submit(self, operation: int, *args) -> Future:
+        """Envía la solicitud sin esperar la respuesta (permite encadenar varias)"""
+        future: Future = Future()
+        with self._pending_lock:
+            if self.closed:
+                raise ConnectionError("Conexión con el servidor de repositorio cerrada")
+            request_id = next(self._ids) & 0xFFFFFFFF
+            self._pending[request_id] = future
+        frame = protocol.pack_frame(request_id, operation, list(args))
+        try:
+            with self._send_lock:
+                self.sock.sendall(frame)
+        except OSError as e:
+            self._fail_pending(e)
+            raise ConnectionError(f"No se pudo enviar al servidor de repositorio: {e}") from e
+        return future
+
+    def call(self, operation: int, *args) -> Any:
+        future = self.submit(operation, *args)
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            # La solicitud puede seguir en cola en el servidor: al cerrar, este deshace la
+            # unidad de trabajo abierta en lugar de aplicarla más tarde
+            self.close()
+            raise TimeoutError(f"El servidor de repositorio no respondió en {self.timeout} s") from None
+
+    def _read_responses(self):
+        error: Exception = ConnectionError("El servidor de repositorio cerró la conexión")
+        try:
+            while True:
+                frame = protocol.read_frame(self.sock)
+                if frame is None:
+                    break
+                request_id, status, value = frame
+                with self._pending_lock:
+                    future = self._pending.pop(request_id, None)
+                if future is None:
+                    continue
+                if status == protocol.STATUS_OK:
+                    future.set_result(value)
+                else:
+                    future.set_exception(IOError(f"Error en el servidor de repositorio: {value}"))
+        except (OSError, ValueError) as e:
+            error = ConnectionError(f"Conexión con el servidor de repositorio perdida: {e}")
+        self._fail_pending(error)
+
+    def _fail_pending(self, error: Exception):
+        with self._pending_lock:
+            self.closed = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def close(self):
+        with self._pending_lock:
+            self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class SocketAgendaRepositoryAdapter(AgendaRepositoryPort):
+    """Adaptador de salida - Cliente del servidor de repositorio por socket Unix"""
+
+    def __init__(self, socket_path: str, timeout: float = 30.0, max_idle_connections: int = 8):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.max_idle_connections = max_idle_connections
+        self.logger = logging.getLogger(__name__)
+        # Conexiones libres; desde la primera escritura de una unidad de trabajo el hilo retiene la suya
+        self._idle: List[_ServerConnection] = []
+        self._idle_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _acquire(self) -> _ServerConnection:
+        with self._idle_lock:
+            while self._idle:
+                connection = self._idle.pop()
+                if not connection.closed:
+                    return connection
+        return _ServerConnection(self.socket_path, self.timeout)
+
+    def _release(self, connection: _ServerConnection):
+        with self._idle_lock:
+            if not connection.closed and len(self._idle) < self.max_idle_connections:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def _call(self, operation: int, *args) -> Any:
+        bound = getattr(self._local, 'connection', None)
+        if bound is not None:
+            # Tras el BEGIN: misma conexión, para leer lo escrito en la transacción
+            return bound.call(operation, *args)
+        connection = self._acquire()
+        try:
+            return connection.call(operation, *args)
+        finally:
+            self._release(connection)
+
+    def _write(self, operation: int, *args) -> Any:
+        """Envía una escritura dentro de una transacción del servidor.
+
+        El BEGIN se envía de forma perezosa, encadenado delante de la primera escritura:
+        los turnos de solo lectura no toman el bloqueo de escritura del servidor.
+        """
+        local = self._local
+        if not getattr(local, 'depth', 0):
+            # Una escritura suelta es su propia unidad de trabajo: el COMMIT sale tras la respuesta
+            with self.unit_of_work():
+                return self._write(operation, *args)
+        if local.connection is None:
+            local.connection = self._acquire()
+        begins = []
+        # Un BEGIN por cada nivel abierto en el cliente, para conservar los savepoints
+        while local.begun < local.depth:
+            begins.append(local.connection.submit(protocol.OP_BEGIN))
+            local.begun += 1
+        result = local.connection.call(operation, *args)
+        for begin in begins:
+            begin.result(self.timeout)
+        return result
+
+    def ping(self) -> bool:
+        """Comprueba que el servidor responde"""
+        try:
+            return bool(self._call(protocol.OP_PING))
+        except Exception as e:
+            self.logger.error(f"Servidor de repositorio no disponible: {e}")
+            return False
+
+    def close(self):
+        """Cierra las conexiones libres"""
+        with self._idle_lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def save(self, event: AgendaEvent) -> bool:
+        """Implementa el puerto: guardar evento"""
+        try:
+            return self._write(protocol.OP_SAVE, event)
+        except Exception as e:
+            self.logger.error(f"Error al guardar en el servidor de repositorio: {e}")
+            return False
+
+    def save_many(self, events: List[AgendaEvent]) -> int:
+        """Implementa el puerto: guardar varios eventos con una sola escritura"""
+        if not events:
+            return 0
+        try:
+            return self._write(protocol.OP_SAVE_MANY, events)
+        except Exception as e:
+            self.logger.error(f"Error al guardar en bloque en el servidor de repositorio: {e}")
+            return 0
+
+    def find_by_date(self, fecha: str) -> List[AgendaEvent]:
+        """Implementa el puerto: buscar por fecha"""
+        try:
+            return self._call(protocol.OP_FIND_BY_DATE, fecha)
+        except Exception as e:
+            self.logger.error(f"Error al buscar por fecha en el servidor de repositorio: {e}")
+            return []
+
+    def find_all(self) -> List[AgendaEvent]:
+        """Implementa el puerto: buscar todos"""
+        try:
+            return self._call(protocol.OP_FIND_ALL)
+        except Exception as e:
+            self.logger.error(f"Error al obtener eventos del servidor de repositorio: {e}")
+            return []
+
+    def search_by_name(self, texto: str, fecha: Optional[str] = None, limit: int = 10) -> List[AgendaEvent]:
+        """Implementa el puerto: buscar por nombre aproximado (índice en memoria del servidor)"""
+        try:
+            return self._call(protocol.OP_SEARCH_BY_NAME, texto, fecha, limit)
+        except Exception as e:
+            self.logger.error(f"Error al buscar por nombre en el servidor de repositorio: {e}")
+            return []
+
+    def delete(self, evento: str, fecha: str) -> bool:
+        """Implementa el puerto: eliminar evento"""
+        try:
+            return self._write(protocol.OP_DELETE, evento, fecha)
+        except Exception as e:
+            self.logger.error(f"Error al eliminar en el servidor de repositorio: {e}")
+            return False
+
+    def delete_all(self) -> bool:
+        """Implementa el puerto: eliminar todos los eventos"""
+        try:
+            return self._write(protocol.OP_DELETE_ALL)
+        except Exception as e:
+            self.logger.error(f"Error al eliminar todos en el servidor de repositorio: {e}")
+            return False
+
+    def archive_before(self, fecha_limite: str) -> int:
+        """Implementa el puerto: archivar eventos anteriores a la fecha límite"""
+        try:
+            return self._write(protocol.OP_ARCHIVE_BEFORE, fecha_limite)
+        except Exception as e:
+            self.logger.error(f"Error al archivar en el servidor de repositorio: {e}")
+            return 0
+
+    def count_archived(self) -> int:
+        """Implementa el puerto: número de eventos en el archivo frío"""
+        try:
+            return self._call(protocol.OP_COUNT_ARCHIVED)
+        except Exception as e:
+            self.logger.error(f"Error al contar el archivo en el servidor de repositorio: {e}")
+            return 0
+    
+    @contextmanager
+    def unit_of_work(self) -> Iterator[None]:
+        """Implementa el puerto: la transacción vive en el servidor, ligada a una conexión"""
+        local = self._local
+        depth = getattr(local, 'depth', 0) + 1
+        if depth == 1:
+            local.connection = None
+            local.begun = 0
+        local.depth = depth
+        try:
+            try:
+                yield
+            except BaseException:
+                # Solo hay algo que deshacer si este nivel llegó a enviar su BEGIN
+                if local.begun >= depth:
+                    try:
+                        local.connection.call(protocol.OP_ROLLBACK)
+                    except Exception as e:
+                        self.logger.error(f"No se pudo deshacer la unidad de trabajo en el servidor: {e}")
+                raise
+            if local.begun >= depth:
+                local.connection.call(protocol.OP_COMMIT)
+        finally:
+            local.depth = depth - 1
+            local.begun = min(local.begun, depth - 1)
+            if depth == 1 and local.connection is not None:
+                connection, local.connection = local.connection, None
+                self._release(connection)
+
+    def prefetch(self, fecha: Optional[str] = None, owner: Optional[int] = None) -> None:
+        """Implementa el puerto: pide al servidor que precargue, sin esperar la respuesta.
+
+        En el servidor la precarga queda para la conexión que la pidió (`owner` no aplica).
+        """
+        try:
+            connection = self._acquire()
+            connection.submit(protocol.OP_PREFETCH, fecha)
+            # La siguiente solicitud por esta conexión queda encadenada detrás de la precarga
+            self._release(connection)
+        except Exception as e:
+            self.logger.warning(f"No se pudo precargar la agenda en el servidor: {e}")
+
+    def export_to_excel(self, export_path: str) -> bool:
+        """Exporta la agenda (la ruta se resuelve en el sistema de archivos del servidor)"""
+        try:
+            return self._call(protocol.OP_EXPORT_TO_EXCEL, export_path)
+        except Exception as e:
+            self.logger.error(f"Error al exportar desde el servidor de repositorio: {e}")
+            return False
@@ -2,13 +2,16 @@
 import streamlit as st
 import html
 import logging
+import os
+from typing import Optional
 from ..ports.service_ports import AIAgentPort
+from ..profiling import TurnProfiler
 
 
 class StreamlitAdapter:
     """Adaptador de entrada para interfaz web con Streamlit."""
     
-    def __init__(self, ai_agent: AIAgentPort):
+    def __init__(self, ai_agent: AIAgentPort, profiler: Optional[TurnProfiler] = None):
         # Guardar el agente en session_state para persistir memoria
         if 'ai_agent' not in st.session_state:
             st.session_state.ai_agent = ai_agent
@@ -16,6 +19,7 @@ class StreamlitAdapter:
         # Usar el agente del session_state o el pasado como parámetro
         self.ai_agent = st.session_state.ai_agent if 'ai_agent' in st.session_state else ai_agent
         self.logger = logging.getLogger(__name__)
+        self.profiler = profiler or TurnProfiler()
     
     def _sanitize_input(self, text: str) -> str:
         """Sanitiza entrada del usuario para prevenir XSS."""
@@ -30,6 +34,14 @@ class StreamlitAdapter:
         st.caption("Usando LangChain como framework principal")
         st.markdown("---")
         
+        # Interruptor de perfilado, solo visible en modo depuración
+        if os.getenv("AGENDA_DEBUG", "").lower() in ("1", "true", "yes"):
+            self.profiler.enabled = st.sidebar.toggle(
+                "Perfilar turnos (cProfile + tracemalloc)",
+                value=self.profiler.enabled,
+                help=f"Guarda un perfil por turno en '{self.profiler.output_dir}'"
+            )
+        
         # Inicializar historial
         if 'messages' not in st.session_state:
             st.session_state.messages = [{
@@ -58,7 +70,8 @@ class StreamlitAdapter:
             with st.chat_message("assistant"):
                 with st.spinner("Procesando con LangChain..."):
                     try:
-                        response = self.ai_agent.process_natural_language(prompt)
+                        with self.profiler.profile_turn(lambda: getattr(self.ai_agent, "last_command", None)):
+                            response = self.ai_agent.process_natural_language(prompt)
                         safe_response = self._sanitize_input(response)
                         st.markdown(safe_response)  # Cambiar a markdown
                     except Exception as e:
@@ -0,0 +1,128 @@
+"""Limitación de tasa y deduplicación de llamadas al LLM."""
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict
+
+
+class TokenBucket:
+    """Cubeta de fichas: `rate` solicitudes por segundo con ráfagas de hasta `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0:
+            raise ValueError("rate debe ser mayor que cero")
+        if capacity < 1:
+            raise ValueError("capacity debe ser mayor que cero")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Bloquea hasta disponer de una ficha"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ThrottledLLM:
+    """Envoltorio del cliente LLM con límite de tasa, tope de concurrencia y single-flight.
+
+    Las consultas idénticas que están en curso comparten una única llamada. El tiempo
+    de espera en cola (fichas + concurrencia) se registra para dimensionar cuotas.
+    """
+
+    _shared: Dict[str, "ThrottledLLM"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, llm, rate_per_second: float = 2.0, burst: int = 5, max_concurrency: int = 4,
+                 metrics_window: int = 1000):
+        if llm is None:
+            raise ValueError("llm no puede ser None")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency debe ser mayor que cero")
+        self.llm = llm
+        self.logger = logging.getLogger(__name__)
+        self._bucket = TokenBucket(rate_per_second, burst)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # Métricas
+        self._waits_ms = deque(maxlen=metrics_window)
+        self._calls = 0
+        self._coalesced = 0
+
+    @classmethod
+    def shared(cls, key: str, factory: Callable[[], object], **config) -> "ThrottledLLM":
+        """Instancia compartida por proceso (todas las sesiones usan el mismo limitador)"""
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(factory(), **config)
+            return cls._shared[key]
+
+    def invoke(self, prompt, *args, **kwargs):
+        """Invoca el LLM respetando los límites; comparte resultado con consultas idénticas en curso"""
+        key = str(prompt)
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._coalesced += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            start = time.perf_counter()
+            self._slots.acquire()
+            try:
+                self._bucket.acquire()
+                self._record_wait((time.perf_counter() - start) * 1000)
+                result = self.llm.invoke(prompt, *args, **kwargs)
+            finally:
+                self._slots.release()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _record_wait(self, wait_ms: float):
+        with self._lock:
+            self._calls += 1
+            self._waits_ms.append(wait_ms)
+        self.logger.debug(f"Espera en cola del LLM: {wait_ms:.1f}ms")
+        if wait_ms > 1000:
+            self.logger.warning(f"Llamada al LLM esperó {wait_ms:.0f}ms en cola")
+
+    def metrics(self) -> Dict[str, float]:
+        """Métricas de la cola: llamadas, deduplicadas y tiempo de espera (ms)"""
+        with self._lock:
+            waits = sorted(self._waits_ms)
+            calls, coalesced, in_flight = self._calls, self._coalesced, len(self._in_flight)
+        p95 = waits[max(0, math.ceil(0.95 * len(waits)) - 1)] if waits else 0.0
+        return {
+            "llm_calls": calls,
+            "llm_coalesced": coalesced,
+            "llm_in_flight": in_flight,
+            "llm_wait_avg_ms": round(sum(waits) / len(waits), 2) if waits else 0.0,
+            "llm_wait_p95_ms": round(p95, 2),
+            "llm_wait_max_ms": round(waits[-1], 2) if waits else 0.0,
+        }
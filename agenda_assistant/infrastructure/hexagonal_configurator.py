@@ -1,9 +1,17 @@
 """Configurador de dependencias hexagonales."""
 import os
+from typing import Optional
 from dotenv import load_dotenv
+from .adapters.archive_store import AgendaArchive
+from .adapters.batch_adapter import BatchAdapter
 from .adapters.excel_adapter import ExcelAgendaAdapter
+from .adapters.file_import_adapter import FileEventSourceAdapter
 from .adapters.langchain_adapter import LangChainAgentAdapter
+from .adapters.offline_llm import OfflineActionLLM
+from .adapters.repository_server import AgendaRepositoryServer
+from .adapters.socket_repository_adapter import SocketAgendaRepositoryAdapter
 from .adapters.streamlit_adapter import StreamlitAdapter
+from .adapters.throttled_llm import ThrottledLLM
 from ..application.agenda_service import AgendaService
 
 
@@ -11,17 +19,47 @@ class HexagonalConfigurator:
     """Configurador puro de inyección de dependencias."""
     
     @staticmethod
-    def wire_dependencies():
-        """Conecta dependencias siguiendo principios hexagonales."""
-        load_dotenv()
-        
-        # Obtener configuración
-        agenda_file = os.getenv("AGENDA_FILE", "agenda.xlsx")
+    def _resolve_api_key():
+        """Obtiene GEMINI_API_KEY, resolviendo referencias a otras variables (KEY_*)."""
         api_key = os.getenv("GEMINI_API_KEY")
         
         # Si la API key es una referencia a otra variable, resolverla
         if api_key and api_key.startswith("KEY_"):
             api_key = os.getenv(api_key)
+        return api_key
+    
+    @staticmethod
+    def _llm_limits():
+        """Límites del cliente LLM: tasa (solicitudes/s), ráfaga y concurrencia máxima."""
+        return {
+            "rate_per_second": float(os.getenv("LLM_RATE_PER_SECOND", "2")),
+            "burst": int(os.getenv("LLM_BURST", "5")),
+            "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+        }
+    
+    @staticmethod
+    def _build_local_repository(keep_in_memory: bool = False):
+        """Agenda en Excel con su archivo frío de eventos pasados."""
+        agenda_file = os.getenv("AGENDA_FILE", "agenda.xlsx")
+        archive_dir = os.getenv("AGENDA_ARCHIVE_DIR", os.path.splitext(agenda_file)[0] + "_archivo")
+        return ExcelAgendaAdapter(agenda_file, archive=AgendaArchive(archive_dir), keep_in_memory=keep_in_memory)
+    
+    @staticmethod
+    def _build_repository():
+        """Puerto secundario: el servidor de repositorio si AGENDA_REPOSITORY_SOCKET está definido,
+        si no, el Excel local."""
+        socket_path = os.getenv("AGENDA_REPOSITORY_SOCKET")
+        if socket_path:
+            return SocketAgendaRepositoryAdapter(socket_path)
+        return HexagonalConfigurator._build_local_repository()
+    
+    @staticmethod
+    def wire_dependencies():
+        """Conecta dependencias siguiendo principios hexagonales."""
+        load_dotenv()
+        
+        # Obtener configuración
+        api_key = HexagonalConfigurator._resolve_api_key()
         
         company_name = os.getenv("COMPANY_NAME", "Tu Empresa")
         
@@ -39,15 +77,84 @@ class HexagonalConfigurator:
         
         # Inyección de dependencias hexagonal:
         # 1. Puerto secundario (salida)
-        repository_port = ExcelAgendaAdapter(agenda_file)
+        repository_port = HexagonalConfigurator._build_repository()
         
         # 2. Núcleo de aplicación
-        agenda_service = AgendaService(repository_port)
+        agenda_service = AgendaService(repository_port, FileEventSourceAdapter())
         
-        # 3. Puerto primario (entrada) - IA
-        ai_agent_port = LangChainAgentAdapter(agenda_service, api_key, company_name)
+        # 3. Puerto primario (entrada) - IA, con un cliente LLM limitado y compartido por el proceso
+        llm = ThrottledLLM.shared(
+            api_key,
+            lambda: LangChainAgentAdapter.create_llm(api_key),
+            **HexagonalConfigurator._llm_limits()
+        )
+        ai_agent_port = LangChainAgentAdapter(agenda_service, api_key, company_name, llm=llm)
         
         # 4. Puerto primario (entrada) - UI
         ui_adapter = StreamlitAdapter(ai_agent_port)
         
-        return ui_adapter
\ No newline at end of file
+        return ui_adapter
+    
+    @staticmethod
+    def wire_batch_dependencies(max_workers: int = 4, offline: bool = False, fake_latency_ms: float = 0.0,
+                                rate_per_second: Optional[float] = None, burst: Optional[int] = None,
+                                max_concurrency: Optional[int] = None):
+        """Conecta dependencias para el procesamiento por lotes (sin Streamlit).
+        
+        Los límites del LLM explícitos sustituyen a los de entorno. En modo sin conexión no
+        hay cuota que respetar: el limitador solo se usa si se pasa algún límite explícito.
+        """
+        load_dotenv()
+        
+        company_name = os.getenv("COMPANY_NAME", "Tu Empresa")
+        api_key = None if offline else HexagonalConfigurator._resolve_api_key()
+        
+        if not offline and not api_key:
+            raise ValueError("GEMINI_API_KEY es obligatoria (o usa el modo sin conexión)")
+        
+        # 1. Puerto secundario compartido: serializa escrituras con su unidad de trabajo
+        repository_port = HexagonalConfigurator._build_repository()
+        
+        # 2. Núcleo de aplicación
+        agenda_service = AgendaService(repository_port, FileEventSourceAdapter())
+        
+        # 3. Un único cliente LLM, limitado y compartido por todos los agentes
+        client = OfflineActionLLM(fake_latency_ms) if offline else LangChainAgentAdapter.create_llm(api_key)
+        overrides = {
+            "rate_per_second": rate_per_second,
+            "burst": burst,
+            "max_concurrency": max_concurrency,
+        }
+        overrides = {name: value for name, value in overrides.items() if value is not None}
+        if offline and not overrides:
+            llm, metrics_provider = client, None
+        else:
+            llm = ThrottledLLM(client, **{**HexagonalConfigurator._llm_limits(), **overrides})
+            metrics_provider = llm.metrics
+        
+        # 4. Un agente (con su memoria) por usuario
+        def agent_factory(user: str) -> LangChainAgentAdapter:
+            agent = LangChainAgentAdapter(agenda_service, api_key, company_name, llm=llm)
+            agent.user_name = user
+            return agent
+        
+        # 5. Puerto primario (entrada) - Lotes
+        return BatchAdapter(agent_factory, max_workers=max_workers, metrics_provider=metrics_provider)
+    
+    @staticmethod
+    def wire_archive_service():
+        """Conecta el caso de uso de archivado (proceso programado, sin LLM ni UI)."""
+        load_dotenv()
+        
+        repository_port = HexagonalConfigurator._build_repository()
+        archive_days = int(os.getenv("AGENDA_ARCHIVE_DAYS", "30"))
+        return AgendaService(repository_port), archive_days
+    
+    @staticmethod
+    def wire_repository_server(socket_path: str = None):
+        """Conecta el servidor de repositorio: único propietario del Excel y del índice en memoria."""
+        load_dotenv()
+        
+        socket_path = socket_path or os.getenv("AGENDA_REPOSITORY_SOCKET", "agenda.sock")
+        repository_port = HexagonalConfigurator._build_local_repository(keep_in_memory=True)
+        return AgendaRepositoryServer(repository_port, socket_path)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import ContextManager, List, Optional
 from ...domain.entities import AgendaEvent
 
 class AgendaRepositoryPort(ABC):
@@ -10,6 +10,11 @@ class AgendaRepositoryPort(ABC):
         """Guarda un evento en el repositorio"""
         pass
     
+    @abstractmethod
+    def save_many(self, events: List[AgendaEvent]) -> int:
+        """Guarda varios eventos en una sola escritura y devuelve cuántos se guardaron"""
+        pass
+    
     @abstractmethod
     def find_by_date(self, fecha: str) -> List[AgendaEvent]:
         """Encuentra eventos por fecha"""
@@ -20,6 +25,11 @@ class AgendaRepositoryPort(ABC):
         """Encuentra todos los eventos"""
         pass
     
+    @abstractmethod
+    def search_by_name(self, texto: str, fecha: Optional[str] = None, limit: int = 10) -> List[AgendaEvent]:
+        """Busca eventos por nombre aproximado, de mejor a peor coincidencia"""
+        pass
+    
     @abstractmethod
     def delete(self, evento: str, fecha: str) -> bool:
         """Elimina un evento específico"""
@@ -30,6 +40,29 @@ class AgendaRepositoryPort(ABC):
         """Elimina todos los eventos"""
         pass
     
+    @abstractmethod
+    def archive_before(self, fecha_limite: str) -> int:
+        """Mueve al archivo frío los eventos anteriores a la fecha límite; devuelve cuántos"""
+        pass
+    
+    @abstractmethod
+    def count_archived(self) -> int:
+        """Número de eventos en el archivo frío"""
+        pass
+    
+    @abstractmethod
+    def unit_of_work(self) -> ContextManager[None]:
+        """Agrupa operaciones: lecturas desde un único snapshot y escrituras confirmadas al final"""
+        pass
+    
+    @abstractmethod
+    def prefetch(self, fecha: Optional[str] = None, owner: Optional[int] = None) -> None:
+        """Precarga el snapshot (y opcionalmente los eventos de una fecha) para la próxima lectura.
+
+        `owner` identifica el hilo que la consumirá (por defecto, el que ejecuta la precarga).
+        """
+        pass
+    
     @abstractmethod
     def export_to_excel(self, export_path: str) -> bool:
         """Exporta la agenda a un archivo Excel específico"""
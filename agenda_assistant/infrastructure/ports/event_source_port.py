@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+from ...domain.entities import AgendaEvent
+
+
+@dataclass
+class ImportChunk:
+    """Bloque de importación: eventos aceptados y filas rechazadas (número, motivo)"""
+    events: List[AgendaEvent] = field(default_factory=list)
+    rejected: List[Tuple[int, str]] = field(default_factory=list)
+
+
+class EventSourcePort(ABC):
+    """Puerto de salida - Fuente de eventos para importación masiva"""
+    
+    @abstractmethod
+    def read_chunks(self, path: str, chunk_size: int = 5000) -> Iterator[ImportChunk]:
+        """Lee y valida el archivo por bloques, sin cargarlo completo en memoria"""
+        pass
@@ -1,15 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import ContextManager, List, Optional
 from ...domain.entities import AgendaEvent
 
 class AgendaServicePort(ABC):
     """Puerto de entrada - Interfaz de servicios de agenda"""
     
+    @abstractmethod
+    def unit_of_work(self) -> ContextManager[None]:
+        """Agrupa varias operaciones en una lectura y una escritura"""
+        pass
+    
+    @abstractmethod
+    def prefetch(self, fecha: Optional[str] = None, owner: Optional[int] = None) -> None:
+        """Precarga datos de la agenda antes de ejecutar una acción (para el hilo `owner`)"""
+        pass
+    
+    @abstractmethod
+    def has_events(self) -> bool:
+        """Indica si hay eventos en la agenda"""
+        pass
+    
     @abstractmethod
     def create_event(self, evento: str, fecha: str, hora: str) -> str:
         """Crea un nuevo evento"""
         pass
     
+    @abstractmethod
+    def create_recurring_event(self, evento: str, fecha: str, hora: str,
+                               frecuencia: str, fin: str = "") -> str:
+        """Crea un evento recurrente (fin: fecha límite o número de repeticiones)"""
+        pass
+    
     @abstractmethod
     def get_events_by_date(self, fecha: str) -> str:
         """Obtiene eventos por fecha"""
@@ -20,6 +41,16 @@ class AgendaServicePort(ABC):
         """Elimina un evento"""
         pass
     
+    @abstractmethod
+    def find_matching_event(self, evento: str, fecha: Optional[str] = None) -> Optional[AgendaEvent]:
+        """Resuelve un nombre aproximado al evento almacenado más parecido"""
+        pass
+    
+    @abstractmethod
+    def search_events(self, texto: str) -> str:
+        """Busca eventos por nombre en todas las fechas"""
+        pass
+    
     @abstractmethod
     def get_all_events(self) -> str:
         """Obtiene todos los eventos"""
@@ -30,6 +61,16 @@ class AgendaServicePort(ABC):
         """Elimina todos los eventos"""
         pass
     
+    @abstractmethod
+    def archive_past_events(self, dias: int) -> str:
+        """Archiva los eventos anteriores al horizonte indicado en días"""
+        pass
+    
+    @abstractmethod
+    def import_events(self, import_path: str) -> str:
+        """Importa eventos desde un archivo CSV o iCalendar"""
+        pass
+    
     @abstractmethod
     def export_agenda(self, export_path: str = None) -> str:
         """Exporta la agenda a Excel"""
@@ -0,0 +1,139 @@
+"""Perfilado opcional por turno de conversación (cProfile y tracemalloc)."""
+import cProfile
+import itertools
+import logging
+import os
+import pstats
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _TurnWorkers:
+    """Perfiles de las tareas que el turno delegó a otros hilos (ej: la precarga)"""
+
+    def __init__(self):
+        self.profiles: List[cProfile.Profile] = []
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def add(self, profiler: cProfile.Profile):
+        with self._lock:
+            if not self.closed:  # Una tarea que termina después del volcado ya no cuenta
+                self.profiles.append(profiler)
+
+    def close(self) -> List[cProfile.Profile]:
+        with self._lock:
+            self.closed = True
+            return list(self.profiles)
+
+
+# Turno perfilado en curso en este hilo (None si el perfilado está desactivado)
+_current_turn: ContextVar[Optional[_TurnWorkers]] = ContextVar("agenda_profiled_turn", default=None)
+
+
+def in_current_turn(function: Callable[..., T]) -> Callable[..., T]:
+    """Envuelve una tarea que el turno ejecuta en otro hilo para incluirla en su perfil.
+
+    cProfile solo mide el hilo que lo activa; sin un turno perfilado en curso
+    devuelve la función tal cual.
+    """
+    workers = _current_turn.get()
+    if workers is None:
+        return function
+
+    def profiled(*args, **kwargs) -> T:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+: un solo perfilador activo por proceso, que ya observa todos los hilos
+            return function(*args, **kwargs)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.disable()
+            workers.add(profiler)
+
+    return profiled
+
+
+class TurnProfiler:
+    """Perfila cada turno y escribe un .prof (cProfile) y un .alloc.txt (tracemalloc).
+
+    Desactivado por defecto; se activa con AGENDA_PROFILE=1 o con `enabled`.
+    Cuando está desactivado, `profile_turn` solo comprueba una bandera.
+    """
+
+    TOP_ALLOCATIONS = 30
+    # tracemalloc es global al proceso: los turnos perfilados se serializan
+    _lock = threading.Lock()
+    _counter = itertools.count(1)
+
+    def __init__(self, output_dir: Optional[str] = None, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv("AGENDA_PROFILE", "").lower() in ("1", "true", "yes", "si", "sí")
+        self.enabled = enabled
+        self.output_dir = output_dir or os.getenv("AGENDA_PROFILE_DIR", "profiles")
+        self.logger = logging.getLogger(__name__)
+
+    @contextmanager
+    def profile_turn(self, tag_provider: Callable[[], Optional[str]]) -> Iterator[None]:
+        """Perfila el bloque; la etiqueta (tipo de acción) se obtiene al terminar"""
+        if not self.enabled:
+            yield
+            return
+
+        with self._lock:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(10)
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            workers = _TurnWorkers()
+            token = _current_turn.set(workers)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                _current_turn.reset(token)
+                after = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+                self._dump([profiler] + workers.close(), before, after, peak, tag_provider())
+
+    def _dump(self, profiles: List[cProfile.Profile], before, after, peak: int, tag: Optional[str]):
+        """Escribe los archivos del turno sin interrumpir la conversación si falla"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            safe_tag = re.sub(r'[^A-Za-z0-9_]+', '_', tag or "TURNO").strip('_') or "TURNO"
+            base_name = f"turn_{datetime.now().strftime('%Y%m%d-%H%M%S')}_{next(self._counter):04d}_{safe_tag}"
+            base_path = os.path.join(self.output_dir, base_name)
+
+            # El hilo del turno más las tareas delegadas (tracemalloc ya es global al proceso)
+            stats = pstats.Stats(profiles[0])
+            for worker in profiles[1:]:
+                stats.add(worker)
+            stats.dump_stats(f"{base_path}.prof")
+
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+            with open(f"{base_path}.alloc.txt", "w", encoding="utf-8") as handle:
+                handle.write(f"Acción: {safe_tag}\n")
+                handle.write(f"Pico de memoria durante el turno: {peak / 1024:.1f} KiB\n")
+                handle.write(f"Top {self.TOP_ALLOCATIONS} diferencias de asignación:\n")
+                for stat in diff[:self.TOP_ALLOCATIONS]:
+                    handle.write(f"{stat}\n")
+
+            self.logger.info(f"Perfil del turno guardado en {base_path}.prof / .alloc.txt")
+        except Exception as e:
+            self.logger.error(f"No se pudo guardar el perfil del turno: {e}")
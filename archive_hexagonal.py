@@ -0,0 +1,36 @@
+"""Archivado de eventos pasados fuera de la agenda activa (pensado para cron)."""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agenda_assistant.infrastructure.hexagonal_configurator import HexagonalConfigurator
+from agenda_assistant.infrastructure.logging_config import setup_logging
+
+# Configurar logging
+logger = setup_logging()
+
+
+def main(argv=None):
+    """Punto de entrada del archivado."""
+    parser = argparse.ArgumentParser(
+        description="Mueve a particiones comprimidas los eventos más antiguos que el horizonte"
+    )
+    parser.add_argument("--dias", type=int, default=None,
+                        help="Horizonte en días (por defecto AGENDA_ARCHIVE_DAYS o 30)")
+    args = parser.parse_args(argv)
+    
+    try:
+        agenda_service, archive_days = HexagonalConfigurator.wire_archive_service()
+        result = agenda_service.archive_past_events(args.dias if args.dias is not None else archive_days)
+        logger.info(result)
+        print(result)
+        return 0 if not result.startswith("Error") else 1
+    except Exception as e:
+        logger.error(f"Error inesperado: {str(e)}", exc_info=True)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Procesamiento por lotes de solicitudes en lenguaje natural (JSONL)."""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agenda_assistant.infrastructure.hexagonal_configurator import HexagonalConfigurator
+from agenda_assistant.infrastructure.logging_config import setup_logging
+
+# Configurar logging
+logger = setup_logging()
+
+
+def parse_args(argv=None):
+    """Define los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Procesa un archivo JSONL de solicitudes {\"user\": ..., \"query\": ...}"
+    )
+    parser.add_argument("input", help="Archivo JSONL de entrada ('-' para stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Archivo JSONL de resultados ('-' para stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Hilos para llamadas al LLM (por defecto 4)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Usa un LLM falso que ejecuta consultas ya escritas como acciones (AGREGAR|...)")
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0,
+                        help="Latencia simulada del LLM falso en milisegundos")
+    parser.add_argument("--llm-rate", type=float, default=None,
+                        help="Solicitudes/s al LLM (por defecto LLM_RATE_PER_SECOND; sin límite con --offline)")
+    parser.add_argument("--llm-burst", type=int, default=None,
+                        help="Ráfaga máxima de solicitudes al LLM (por defecto LLM_BURST)")
+    parser.add_argument("--llm-concurrency", type=int, default=None,
+                        help="Llamadas simultáneas al LLM (por defecto LLM_MAX_CONCURRENCY)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Punto de entrada del procesamiento por lotes."""
+    args = parse_args(argv)
+    try:
+        logger.info("Iniciando procesamiento por lotes")
+        batch_adapter = HexagonalConfigurator.wire_batch_dependencies(
+            max_workers=args.workers,
+            offline=args.offline,
+            fake_latency_ms=args.fake_latency_ms,
+            rate_per_second=args.llm_rate,
+            burst=args.llm_burst,
+            max_concurrency=args.llm_concurrency
+        )
+        
+        source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            summary = batch_adapter.run(source, sink)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sink is not sys.stdout:
+                sink.close()
+        
+        batch_adapter.print_summary(summary)
+        return 0 if summary["errors"] == 0 else 1
+        
+    except ValueError as e:
+        logger.error(f"Error de configuración: {str(e)}")
+        return 2
+    except Exception as e:
+        logger.error(f"Error inesperado: {str(e)}", exc_info=True)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Servidor de repositorio compartido por varias réplicas de la aplicación."""
+import argparse
+import os
+import signal
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agenda_assistant.infrastructure.hexagonal_configurator import HexagonalConfigurator
+from agenda_assistant.infrastructure.logging_config import setup_logging
+
+# Configurar logging
+logger = setup_logging()
+
+
+def main(argv=None):
+    """Punto de entrada del servidor de repositorio."""
+    parser = argparse.ArgumentParser(
+        description="Sirve la agenda por socket Unix como único propietario del almacenamiento"
+    )
+    parser.add_argument("--socket", default=None,
+                        help="Ruta del socket (por defecto AGENDA_REPOSITORY_SOCKET o agenda.sock)")
+    args = parser.parse_args(argv)
+
+    try:
+        server = HexagonalConfigurator.wire_repository_server(args.socket)
+        # docker stop envía SIGTERM: salir limpiamente para liberar el socket
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        server.serve_forever()
+        return 0
+    except KeyboardInterrupt:
+        logger.info("Servidor de repositorio detenido")
+        return 0
+    except Exception as e:
+        logger.error(f"Error inesperado: {str(e)}", exc_info=True)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from agenda_assistant.application.agenda_service import AgendaService
+from agenda_assistant.domain.entities import AgendaEvent
+from agenda_assistant.infrastructure.adapters.archive_store import AgendaArchive
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'), archive=AgendaArchive(str(tmp_path / 'archivo')))
+    repository.save_many([
+        AgendaEvent('Viejo informe', '2020-03-10', '09:00'),
+        AgendaEvent('Futuro plan', '2099-01-01', '09:00'),
+    ])
+    assert repository.archive_before('2021-01-01') == 1
+    return repository
+
+
+def test_archived_events_are_found_by_date_and_by_name(repository):
+    assert [e.evento for e in repository.find_by_date('2020-03-10')] == ['Viejo informe']
+    assert [e.evento for e in repository.find_all()] == ['Futuro plan']
+    assert [e.fecha for e in repository.search_by_name('viejo')] == ['2020-03-10']
+
+
+def test_dateless_delete_reaches_the_archive(repository):
+    service = AgendaService(repository)
+    match = service.find_matching_event('viejo')
+    assert (match.evento, match.fecha) == ('Viejo informe', '2020-03-10')
+    assert service.delete_event(match.evento, match.fecha) == "Evento 'Viejo informe' eliminado de 2020-03-10"
+    assert repository.search_by_name('viejo') == []
+    assert repository.count_archived() == 0
+
+
+def test_only_archived_events_still_count(repository):
+    service = AgendaService(repository)
+    repository.delete('Futuro plan', '2099-01-01')
+    assert service.has_events()
+    assert service.delete_all_events() == "Todos los eventos han sido eliminados de la agenda"
+    assert repository.count_archived() == 0
+    assert not service.has_events()
+
+
+def test_archive_survives_a_failed_commit(repository, monkeypatch):
+    def failing_write(df):
+        raise PermissionError("archivo abierto en otro programa")
+
+    monkeypatch.setattr(repository, '_write_dataframe', failing_write)
+    assert not repository.delete_all()
+    assert repository.count_archived() == 1
+    assert [e.evento for e in repository.find_all()] == ['Futuro plan']
+
+
+def test_archiving_waits_for_writers_on_the_same_file(repository, tmp_path):
+    archiver = ExcelAgendaAdapter(repository.file_path, archive=AgendaArchive(str(tmp_path / 'archivo')))
+    repository.save(AgendaEvent('Otro viejo', '2020-04-01', '09:00'))
+    archived = []
+
+    with repository.unit_of_work():
+        repository.save(AgendaEvent('Nuevo', '2099-02-01', '09:00'))
+        worker = threading.Thread(target=lambda: archived.append(archiver.archive_before('2021-01-01')))
+        worker.start()
+        worker.join(0.3)
+        assert worker.is_alive()
+    worker.join(5)
+
+    assert archived == [1]
+    assert [e.evento for e in repository.find_all()] == ['Futuro plan', 'Nuevo']
+    assert [e.evento for e in repository.find_by_date('2020-04-01')] == ['Otro viejo']
+
+
+def test_archive_temp_files_are_unique_per_writer(repository, monkeypatch):
+    replaced = []
+    original = os.replace
+    monkeypatch.setattr(os, 'replace', lambda src, dst: (replaced.append(src), original(src, dst)))
+
+    repository.archive.append(pd.DataFrame([['Tercero', '2020-05-01', '09:00']], columns=['Evento', 'Fecha', 'Hora']))
+
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    assert replaced and all(path.endswith(suffix) for path in replaced)
+    assert not [name for name in os.listdir(repository.archive.archive_dir) if name.endswith('.tmp')]
@@ -0,0 +1,116 @@
+import io
+import json
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from agenda_assistant.infrastructure.adapters.batch_adapter import BatchAdapter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RecordingAgent:
+    def __init__(self, user, seen):
+        self.user = user
+        self.seen = seen
+
+    def process_natural_language(self, query):
+        time.sleep(random.uniform(0, 0.01))
+        if query == 'falla':
+            raise RuntimeError('agente caído')
+        self.seen.append((self.user, query))
+        return f"{self.user}: {query}"
+
+
+def jsonl(*items):
+    return io.StringIO(''.join((item if isinstance(item, str) else json.dumps(item)) + '\n' for item in items))
+
+
+def run(adapter, source):
+    sink = io.StringIO()
+    summary = adapter.run(source, sink)
+    return summary, [json.loads(line) for line in sink.getvalue().splitlines()]
+
+
+def test_each_user_is_processed_in_order_by_its_own_agent():
+    seen, agents = [], []
+    lock = threading.Lock()
+
+    def factory(user):
+        with lock:
+            agents.append(user)
+        return RecordingAgent(user, seen)
+
+    requests = [{'user': f'u{i % 3}', 'query': f'q{i}'} for i in range(30)]
+    summary, results = run(BatchAdapter(factory, max_workers=3), jsonl(*requests))
+
+    assert sorted(agents) == ['u0', 'u1', 'u2']
+    for user in ('u0', 'u1', 'u2'):
+        expected = [r['query'] for r in requests if r['user'] == user]
+        assert [q for u, q in seen if u == user] == expected
+        assert [r['query'] for r in results if r['user'] == user] == expected
+    assert summary['total'] == summary['ok'] == 30
+
+
+def test_invalid_lines_and_agent_errors_are_reported():
+    summary, results = run(BatchAdapter(lambda user: RecordingAgent(user, [])), jsonl(
+        {'user': 'ana', 'query': 'hola'},
+        'esto no es json',
+        {'user': 'ana'},
+        '',
+        {'user': 'luis', 'query': 'falla'},
+    ))
+
+    by_line = {r['line']: r for r in results}
+    assert sorted(by_line) == [1, 2, 3, 5]
+    assert by_line[1]['response'] == 'ana: hola'
+    assert by_line[2]['error'].startswith('Línea inválida')
+    assert by_line[3]['error'].startswith('Línea inválida')
+    assert 'latency_ms' not in by_line[2]
+    assert by_line[5]['error'] == 'agente caído'
+    assert 'latency_ms' in by_line[5]
+    assert (summary['total'], summary['ok'], summary['errors'], summary['users']) == (4, 1, 3, 2)
+
+
+def test_summary_fields_include_latencies_and_provider_metrics():
+    adapter = BatchAdapter(lambda user: RecordingAgent(user, []),
+                           metrics_provider=lambda: {'llm_calls': 7})
+    summary, results = run(adapter, jsonl(*({'user': 'ana', 'query': f'q{i}'} for i in range(5))))
+
+    latencies = sorted(r['latency_ms'] for r in results)
+    assert summary['latency_max_ms'] == latencies[-1]
+    assert summary['latency_p50_ms'] == latencies[2]
+    assert summary['latency_p95_ms'] == latencies[-1]
+    assert summary['throughput_rps'] > 0
+    assert summary['llm_calls'] == 7
+    assert BatchAdapter._percentile([], 95) == 0.0
+
+
+@pytest.fixture
+def batch_main(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(ROOT)
+    monkeypatch.delenv('AGENDA_REPOSITORY_SOCKET', raising=False)
+    monkeypatch.setenv('AGENDA_FILE', str(tmp_path / 'agenda.xlsx'))
+    monkeypatch.setenv('AGENDA_ARCHIVE_DIR', str(tmp_path / 'agenda_archivo'))
+    import batch_hexagonal
+    return batch_hexagonal.main
+
+
+def test_main_exit_codes(tmp_path, batch_main):
+    ok = tmp_path / 'ok.jsonl'
+    ok.write_text(json.dumps({'user': 'Ana', 'query': 'AGREGAR|Dentista|2024-01-15|09:00'}) + '\n'
+                  + json.dumps({'user': 'Ana', 'query': 'CONSULTAR|2024-01-15'}) + '\n', encoding='utf-8')
+    bad = tmp_path / 'bad.jsonl'
+    bad.write_text('{"user": "Ana"}\n', encoding='utf-8')
+    out = tmp_path / 'out.jsonl'
+
+    assert batch_main([str(ok), '-o', str(out), '--offline']) == 0
+    responses = [json.loads(line)['response'] for line in out.read_text(encoding='utf-8').splitlines()]
+    assert responses[1] == 'Ana, Eventos para 2024-01-15:\n- Dentista a las 09:00'
+
+    assert batch_main([str(bad), '-o', str(out), '--offline']) == 1
+    assert batch_main([str(tmp_path / 'no_existe.jsonl'), '--offline']) == 2
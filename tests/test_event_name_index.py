@@ -0,0 +1,84 @@
+import pandas as pd
+
+from agenda_assistant.application.agenda_service import AgendaService
+from agenda_assistant.domain.entities import AgendaEvent
+from agenda_assistant.infrastructure.adapters.event_name_index import EventNameIndex
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+
+
+def names(results):
+    return [event.evento for _, event in results]
+
+
+def test_exact_match_outranks_fuzzy_tie():
+    # Sin palabras vacías ambos nombres tienen los mismos trigramas
+    index = EventNameIndex([
+        AgendaEvent('Reunión Ana', '2024-01-15', '09:00'),
+        AgendaEvent('Reunión con Ana', '2024-01-15', '11:00'),
+    ])
+    assert names(index.search('Reunión con Ana')) == ['Reunión con Ana', 'Reunión Ana']
+    assert names(index.search('reunión ana')) == ['Reunión Ana', 'Reunión con Ana']
+
+
+def test_exact_match_ignores_case_spaces_and_html_entities():
+    index = EventNameIndex([
+        AgendaEvent('Cena familiar', '2024-01-15', '20:00'),
+        AgendaEvent('Cena &amp; cine', '2024-01-15', '21:00'),
+    ])
+    assert names(index.search('  CENA & CINE ', limit=1)) == ['Cena &amp; cine']
+
+
+def test_ties_keep_insertion_order():
+    index = EventNameIndex([
+        AgendaEvent('Dentista', '2024-01-10', '09:00'),
+        AgendaEvent('Dentista', '2024-01-20', '09:00'),
+    ])
+    assert [e.fecha for _, e in index.search('dentist')] == ['2024-01-10', '2024-01-20']
+
+
+def test_accents_and_stop_words_do_not_matter():
+    index = EventNameIndex([AgendaEvent('Revisión médica', '2024-01-15', '09:00')])
+    assert names(index.search('la revision medica')) == ['Revisión médica']
+
+
+def test_min_score_and_predicate_filter_candidates():
+    index = EventNameIndex([
+        AgendaEvent('Llamada cliente', '2024-01-20', '10:00'),
+        AgendaEvent('Llamada proveedor', '2024-01-21', '10:00'),
+    ])
+    assert index.search('gimnasio') == []
+    on_date = index.search('llamada', predicate=lambda e: e if e.fecha == '2024-01-21' else None)
+    assert names(on_date) == ['Llamada proveedor']
+
+
+def test_delete_event_requires_the_exact_stored_name(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    service = AgendaService(repository)
+    service.create_event('Reunión Ana', '2024-01-15', '09:00')
+    service.create_event('Reunión con Ana', '2024-01-15', '11:00')
+    service.create_event('Llamada', '2024-01-20', '10:00')
+
+    assert service.find_matching_event('Reunión con Ana', '2024-01-15').evento == 'Reunión con Ana'
+    assert service.delete_event('llamar', '2024-01-20').startswith('No se encontró')
+    assert service.delete_event('reunión con ana', '2024-01-15') == "Evento 'Reunión con Ana' eliminado de 2024-01-15"
+    assert [e.evento for e in repository.find_by_date('2024-01-15')] == ['Reunión Ana']
+
+
+def test_from_rows_skips_rows_that_cannot_be_converted(caplog):
+    index = EventNameIndex.from_rows([
+        {'Evento': 'Dentista', 'Fecha': '2024-01-15', 'Hora': '09:00'},
+        {'Evento': 'Sin hora', 'Fecha': '2024-01-15', 'Hora': float('nan')},
+    ], AgendaEvent.from_dict)
+    assert len(index) == 1
+    assert 'Sin hora' in caplog.text
+
+
+def test_hand_edited_row_does_not_fail_the_save(tmp_path):
+    path = tmp_path / 'agenda.xlsx'
+    pd.DataFrame([['Dentista', '2024-01-15', None]], columns=['Evento', 'Fecha', 'Hora']).to_excel(path, index=False)
+    repository = ExcelAgendaAdapter(str(path))
+    service = AgendaService(repository)
+
+    assert service.create_event('Cena', '2024-01-15', '21:00').startswith("Evento 'Cena' agregado")
+    assert len(pd.read_excel(path)) == 2
+    assert [e.evento for e in repository.search_by_name('cena')] == ['Cena']
@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from agenda_assistant.domain.entities import AgendaEvent
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+
+
+def snapshot_signature(repository):
+    reader = pa.ipc.open_file(pa.memory_map(repository.snapshot_path, 'r'))
+    return reader.schema.metadata[ExcelAgendaAdapter.SNAPSHOT_SIGNATURE_KEY].decode()
+
+
+def test_snapshot_is_regenerated_after_a_write(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    repository.save(AgendaEvent('Dentista', '2024-01-15', '09:00'))
+
+    assert os.path.exists(repository.snapshot_path)
+    assert snapshot_signature(repository) == repository._file_signature()
+    assert list(pd.read_feather(repository.snapshot_path)['Evento']) == ['Dentista']
+
+
+def test_external_edit_invalidates_the_snapshot(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    repository.save(AgendaEvent('Dentista', '2024-01-15', '09:00'))
+    stale = snapshot_signature(repository)
+
+    # Edición manual del libro, sin pasar por el adaptador
+    pd.DataFrame([['Editado', '2024-01-16', '10:00'], ['Otro', '2024-01-17', '11:00']],
+                 columns=['Evento', 'Fecha', 'Hora']).to_excel(repository.file_path, index=False)
+
+    assert repository._read_snapshot(repository._file_signature()) is None
+    assert [e.evento for e in repository.find_all()] == ['Editado', 'Otro']
+    assert snapshot_signature(repository) != stale
+    assert snapshot_signature(repository) == repository._file_signature()
+
+
+def test_unreadable_snapshot_falls_back_to_excel(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    repository.save(AgendaEvent('Dentista', '2024-01-15', '09:00'))
+    with open(repository.snapshot_path, 'wb') as handle:
+        handle.write(b'no es feather')
+
+    assert [e.evento for e in repository.find_all()] == ['Dentista']
+    assert snapshot_signature(repository) == repository._file_signature()
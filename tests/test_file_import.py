@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from agenda_assistant.application.agenda_service import AgendaService
+from agenda_assistant.domain.entities import AgendaEvent
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+from agenda_assistant.infrastructure.adapters.file_import_adapter import FileEventSourceAdapter
+
+
+def chunk(rows):
+    df = pd.DataFrame(rows, columns=['Evento', 'Fecha', 'Hora'])
+    df['Fila'] = range(1, len(df) + 1)
+    return df
+
+
+def test_validate_chunk_accepts_and_normalizes_valid_rows():
+    result = FileEventSourceAdapter()._validate_chunk(chunk([
+        [' Dentista ', '2024-01-15', '9:05'],
+        ['Cena', '2024-02-29', '21:00'],
+    ]))
+    assert result.events == [
+        AgendaEvent('Dentista', '2024-01-15', '09:05'),
+        AgendaEvent('Cena', '2024-02-29', '21:00'),
+    ]
+    assert result.rejected == []
+
+
+def test_validate_chunk_reports_every_reason_with_row_number():
+    result = FileEventSourceAdapter()._validate_chunk(chunk([
+        ['Ok', '2024-01-15', '10:00'],
+        ['', '2024-01-15', '10:00'],
+        ['Sin fecha', '2023-02-29', '25:00'],
+    ]))
+    assert [e.evento for e in result.events] == ['Ok']
+    assert result.rejected == [
+        (2, 'evento vacío'),
+        (3, 'fecha inválida (2023-02-29); hora inválida (25:00)'),
+    ]
+
+
+def test_ics_unfolding_and_escapes(tmp_path):
+    path = tmp_path / 'agenda.ics'
+    path.write_text(
+        'BEGIN:VCALENDAR\r\n'
+        'BEGIN:VEVENT\r\n'
+        'SUMMARY:Reunión de presupuesto\\, trimestre\r\n'
+        '  uno\r\n'
+        'DTSTART;TZID=Europe/Madrid:20240115T093000\r\n'
+        'END:VEVENT\r\n'
+        'BEGIN:VEVENT\r\n'
+        'SUMMARY:Festivo\r\n'
+        'DTSTART;VALUE=DATE:20240101\r\n'
+        'END:VEVENT\r\n'
+        'END:VCALENDAR\r\n',
+        encoding='utf-8'
+    )
+    chunks = list(FileEventSourceAdapter().read_chunks(str(path)))
+    assert chunks[0].events == [AgendaEvent('Reunión de presupuesto, trimestre uno', '2024-01-15', '09:30')]
+    # Los eventos de día completo no tienen hora
+    assert chunks[0].rejected == [(2, 'hora inválida ()')]
+
+
+def test_csv_headers_are_case_insensitive_and_chunked(tmp_path):
+    path = tmp_path / 'eventos.csv'
+    path.write_text('evento, FECHA ,hora\nA,2024-01-15,10:00\nB,2024-01-16,11:00\nC,mal,12:00\n',
+                    encoding='utf-8')
+    chunks = list(FileEventSourceAdapter().read_chunks(str(path), chunk_size=2))
+    assert [[e.evento for e in c.events] for c in chunks] == [['A', 'B'], []]
+    assert chunks[1].rejected == [(3, 'fecha inválida (mal)')]
+
+
+def test_unsupported_extension_is_rejected(tmp_path):
+    path = tmp_path / 'eventos.txt'
+    path.write_text('x', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(FileEventSourceAdapter().read_chunks(str(path)))
+
+
+def test_import_uses_the_path_as_given(tmp_path):
+    path = tmp_path / 'a&b.csv'
+    path.write_text('Evento,Fecha,Hora\nA,2024-01-15,10:00\nB,2024-01-15,11:00\n', encoding='utf-8')
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    service = AgendaService(repository, FileEventSourceAdapter())
+
+    result = service.import_events(str(path))
+
+    assert result.startswith('Importación completada: 2 eventos agregados')
+    assert [e.evento for e in repository.find_by_date('2024-01-15')] == ['A', 'B']
@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agenda_assistant.application.agenda_service import AgendaService
+from agenda_assistant.domain.entities import AgendaEvent
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+from agenda_assistant.infrastructure.adapters.langchain_adapter import LangChainAgentAdapter
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    repository.save(AgendaEvent('Dentista', '2024-01-15', '09:00'))
+    return repository
+
+
+def count_disk_reads(repository, monkeypatch):
+    reads = []
+    original = repository._read_dataframe
+
+    def read():
+        reads.append(threading.get_ident())
+        return original()
+
+    monkeypatch.setattr(repository, '_read_dataframe', read)
+    return reads
+
+
+def prefetch_from_pool(repository, fecha=None, owner=None):
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(repository.prefetch, fecha, owner).result()
+
+
+def test_owner_consumes_its_prefetch_without_reading_disk(repository, monkeypatch):
+    prefetch_from_pool(repository, '2024-01-15', threading.get_ident())
+    reads = count_disk_reads(repository, monkeypatch)
+
+    with repository.unit_of_work():
+        assert [e.evento for e in repository.find_by_date('2024-01-15')] == ['Dentista']
+    assert reads == []
+
+
+def test_prefetch_for_another_caller_is_not_taken(repository, monkeypatch):
+    prefetch_from_pool(repository, '2024-01-15', owner=-1)
+    reads = count_disk_reads(repository, monkeypatch)
+
+    with repository.unit_of_work():
+        repository.find_all()
+    assert len(reads) == 1
+    assert -1 in repository._prefetched
+
+
+def test_prefetch_is_discarded_when_the_file_changed(repository):
+    prefetch_from_pool(repository, '2024-01-15', threading.get_ident())
+    ExcelAgendaAdapter(repository.file_path).save(AgendaEvent('Cena', '2024-01-15', '21:00'))
+
+    with repository.unit_of_work():
+        assert [e.evento for e in repository.find_by_date('2024-01-15')] == ['Dentista', 'Cena']
+    assert [e.evento for e in repository.search_by_name('cena')] == ['Cena']
+
+
+def test_unconsumed_prefetches_are_bounded(repository):
+    for owner in range(ExcelAgendaAdapter.MAX_PREFETCHED + 5):
+        repository.prefetch(None, owner)
+    assert len(repository._prefetched) == ExcelAgendaAdapter.MAX_PREFETCHED
+    assert 0 not in repository._prefetched
+
+
+def test_name_index_is_stored_with_its_own_signature(repository):
+    repository.prefetch()
+    signature, index = repository._name_index
+    assert signature == repository._file_signature()
+    assert len(index) == 1
+
+    repository.save(AgendaEvent('Cena', '2024-01-15', '21:00'))
+    assert repository._name_index is None
+    assert [e.evento for e in repository.search_by_name('cena')] == ['Cena']
+
+
+def test_queued_prefetch_is_cancelled_instead_of_awaited(repository):
+    agent = LangChainAgentAdapter(AgendaService(repository), api_key='', llm=object())
+    release = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(release.wait, 5)
+        queued = pool.submit(repository.prefetch, None, threading.get_ident())
+        start = time.monotonic()
+        agent._wait_prefetch(queued)
+        assert time.monotonic() - start < 1
+        assert queued.cancelled()
+        release.set()
+    assert threading.get_ident() not in repository._prefetched
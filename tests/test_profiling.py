@@ -0,0 +1,51 @@
+import pstats
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from agenda_assistant.application.agenda_service import AgendaService
+from agenda_assistant.domain.entities import AgendaEvent
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+from agenda_assistant.infrastructure.adapters.langchain_adapter import LangChainAgentAdapter
+from agenda_assistant.infrastructure.adapters.offline_llm import OfflineActionLLM
+from agenda_assistant.infrastructure.profiling import TurnProfiler, in_current_turn
+
+
+def worker_task():
+    return sum(range(1000))
+
+
+def profiled_functions(output_dir):
+    (prof,) = output_dir.glob('*.prof')
+    return {name for _, _, name in pstats.Stats(str(prof)).stats}
+
+
+def test_tasks_delegated_to_other_threads_are_in_the_turn_profile(tmp_path):
+    profiler = TurnProfiler(output_dir=str(tmp_path), enabled=True)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with profiler.profile_turn(lambda: 'PRUEBA'):
+            assert pool.submit(in_current_turn(worker_task)).result() == worker_task()
+
+    assert 'worker_task' in profiled_functions(tmp_path)
+    assert len(list(tmp_path.glob('*_PRUEBA.alloc.txt'))) == 1
+
+
+def test_without_a_profiled_turn_the_task_is_not_wrapped():
+    assert in_current_turn(worker_task) is worker_task
+    with TurnProfiler(enabled=False).profile_turn(lambda: None):
+        assert in_current_turn(worker_task) is worker_task
+
+
+def test_agent_turn_profile_includes_the_repository_prefetch(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    repository.save(AgendaEvent('Dentista', '2024-01-15', '09:00'))
+    agent = LangChainAgentAdapter(AgendaService(repository), api_key='', llm=OfflineActionLLM(latency_ms=50))
+    agent.user_name = 'Ana'
+    output_dir = tmp_path / 'profiles'
+
+    with TurnProfiler(output_dir=str(output_dir), enabled=True).profile_turn(lambda: agent.last_command):
+        response = agent.process_natural_language('CONSULTAR|2024-01-15')
+
+    assert response == 'Ana, Eventos para 2024-01-15:\n- Dentista a las 09:00'
+    functions = profiled_functions(output_dir)
+    assert {'prefetch', '_read_dataframe', '_events_on_date', 'get_events_by_date'} <= functions
+    assert threading.get_ident() not in repository._prefetched
@@ -0,0 +1,115 @@
+import pytest
+
+from agenda_assistant.application.agenda_service import AgendaService
+from agenda_assistant.domain.entities import RecurrenceRule, RecurringEvent
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+from agenda_assistant.infrastructure.adapters.langchain_adapter import LangChainAgentAdapter
+
+
+def dates(rule, inicio, desde, hasta):
+    return list(rule.iter_dates(inicio, desde, hasta))
+
+
+def test_weekly_dates_within_range():
+    rule = RecurrenceRule('SEMANAL')
+    assert dates(rule, '2024-01-01', '2024-01-10', '2024-01-31') == [
+        '2024-01-15', '2024-01-22', '2024-01-29'
+    ]
+
+
+def test_interval_and_until_limit_the_series():
+    rule = RecurrenceRule('DIARIA', intervalo=3, hasta='2024-01-10')
+    assert dates(rule, '2024-01-01', '2024-01-01', '2024-12-31') == [
+        '2024-01-01', '2024-01-04', '2024-01-07', '2024-01-10'
+    ]
+
+
+def test_monthly_day_31_skips_short_months():
+    rule = RecurrenceRule('MENSUAL')
+    assert dates(rule, '2024-01-31', '2024-01-01', '2024-07-31') == [
+        '2024-01-31', '2024-03-31', '2024-05-31', '2024-07-31'
+    ]
+
+
+def test_monthly_day_31_count_only_counts_existing_days():
+    rule = RecurrenceRule('MENSUAL', repeticiones=3)
+    assert dates(rule, '2024-01-31', '2024-01-01', '2025-12-31') == [
+        '2024-01-31', '2024-03-31', '2024-05-31'
+    ]
+
+
+def test_count_starting_after_range_start():
+    rule = RecurrenceRule('SEMANAL', repeticiones=4)
+    # Las ocurrencias anteriores al rango siguen consumiendo repeticiones
+    assert dates(rule, '2024-01-01', '2024-01-20', '2024-12-31') == ['2024-01-22']
+
+
+def test_excluded_dates_are_skipped_but_still_count():
+    rule = RecurrenceRule('DIARIA', repeticiones=3, excluir=['2024-01-02'])
+    assert dates(rule, '2024-01-01', '2024-01-01', '2024-12-31') == ['2024-01-01', '2024-01-03']
+
+
+def test_rule_string_round_trip():
+    rule = RecurrenceRule('semanal', intervalo=2, hasta='2024-06-30',
+                          excluir=['2024-02-12', '2024-01-29', '2024-01-29'])
+    text = rule.to_string()
+    assert text == 'SEMANAL;INTERVALO=2;HASTA=2024-06-30;EXCLUIR=2024-01-29,2024-02-12'
+    assert RecurrenceRule.from_string(text) == rule
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        RecurrenceRule('ANUAL')
+    with pytest.raises(ValueError):
+        RecurrenceRule('DIARIA', intervalo=0)
+    with pytest.raises(ValueError):
+        RecurrenceRule('DIARIA', excluir=['29/01/2024'])
+    with pytest.raises(ValueError):
+        RecurrenceRule('SEMANAL', hasta='2024-06-30T10:00')
+
+
+def test_until_before_start_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        RecurringEvent('Pilates', '2030-01-01', '07:00', RecurrenceRule('SEMANAL', hasta='2029-01-01'))
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+
+    result = AgendaService(repository).create_recurring_event('Pilates', '2030-01-01', '07:00', 'SEMANAL', '2029-01-01')
+
+    assert result.startswith('Error de validación')
+    assert repository.find_all() == []
+
+
+def test_without_occurrence_keeps_the_rest_of_the_series():
+    series = RecurringEvent('Yoga', '2024-01-01', '07:00', RecurrenceRule('SEMANAL'))
+    remaining = series.without_occurrence('2024-01-29')
+    assert remaining.regla.excluir == ['2024-01-29']
+    assert [e.fecha for e in remaining.occurrences('2024-01-22', '2024-02-05')] == ['2024-01-22', '2024-02-05']
+
+
+def test_without_last_occurrence_returns_none():
+    series = RecurringEvent('Yoga', '2024-01-01', '07:00', RecurrenceRule('DIARIA', repeticiones=1))
+    assert series.without_occurrence('2024-01-01') is None
+
+
+def test_deleting_one_occurrence_keeps_the_series(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    repository.save(RecurringEvent('Yoga', '2024-01-01', '07:00', RecurrenceRule('SEMANAL')))
+
+    assert repository.delete('Yoga', '2024-01-29')
+    assert repository.find_by_date('2024-01-29') == []
+    assert [e.evento for e in repository.find_by_date('2024-02-05')] == ['Yoga']
+    assert not repository.delete('Yoga', '2024-01-30')
+
+
+def test_dateless_delete_proposes_the_next_remaining_occurrence(tmp_path):
+    repository = ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx'))
+    agent = LangChainAgentAdapter(AgendaService(repository), api_key='', llm=object())
+    agent.user_name = 'Ana'
+    repository.save(RecurringEvent('Yoga', '2090-01-01', '07:00', RecurrenceRule('SEMANAL')))
+    assert repository.delete('Yoga', '2090-01-01')
+
+    proposal = agent._execute_action('ELIMINAR|yoga')
+    assert "'Yoga' del 2090-01-08" in proposal
+    assert agent._execute_action('SI') == "Ana, Evento 'Yoga' eliminado de 2090-01-08"
+    assert repository.find_by_date('2090-01-08') == []
+    assert [e.evento for e in repository.find_by_date('2090-01-15')] == ['Yoga']
@@ -0,0 +1,103 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from agenda_assistant.domain.entities import AgendaEvent, RecurrenceRule, RecurringEvent
+from agenda_assistant.infrastructure.adapters import repository_protocol as protocol
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+from agenda_assistant.infrastructure.adapters.repository_server import AgendaRepositoryServer
+from agenda_assistant.infrastructure.adapters.socket_repository_adapter import SocketAgendaRepositoryAdapter
+
+
+@pytest.mark.parametrize('value', [
+    None, True, False, 0, -2 ** 63, 2 ** 63 - 1, 1.5, '', 'Reunión 🗓 con Ana',
+    [1, 'a', None, [True]], {'clave': [1, 2], 'ñ': {'x': 0.25}},
+])
+def test_encode_decode_round_trip(value):
+    assert protocol.decode(protocol.encode(value)) == value
+
+
+def test_events_round_trip_with_their_type():
+    single = AgendaEvent('Dentista', '2024-01-15', '09:00')
+    series = RecurringEvent('Yoga', '2024-01-01', '07:00',
+                            RecurrenceRule('SEMANAL', hasta='2024-03-31', excluir=['2024-01-29']))
+    decoded = protocol.decode(protocol.encode([single, series]))
+    assert decoded == [single, series]
+    assert type(decoded[0]) is AgendaEvent
+    assert decoded[1].regla.excluir == ['2024-01-29']
+
+
+def test_unsupported_type_is_rejected():
+    with pytest.raises(TypeError):
+        protocol.encode(object())
+
+
+def test_frames_keep_request_ids_and_detect_close():
+    left, right = socket.socketpair()
+    try:
+        left.sendall(protocol.pack_frame(7, protocol.OP_SAVE, ['a']) + protocol.pack_frame(8, protocol.OP_PING, []))
+        assert protocol.read_frame(right) == (7, protocol.OP_SAVE, ['a'])
+        assert protocol.read_frame(right) == (8, protocol.OP_PING, [])
+        left.close()
+        assert protocol.read_frame(right) is None
+    finally:
+        right.close()
+
+
+class SlowSaveAdapter(ExcelAgendaAdapter):
+    def save(self, event):
+        time.sleep(0.5)
+        return super().save(event)
+
+
+@pytest.fixture
+def serve(tmp_path):
+    servers = []
+
+    def start(repository):
+        server = AgendaRepositoryServer(repository, str(tmp_path / f'agenda{len(servers)}.sock'))
+        threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        servers.append(server)
+        return server.socket_path
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_read_only_turn_does_not_wait_for_another_transaction(tmp_path, serve):
+    path = serve(ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx')))
+    writer = SocketAgendaRepositoryAdapter(path)
+    reader = SocketAgendaRepositoryAdapter(path, timeout=2.0)
+    writer.save(AgendaEvent('Dentista', '2024-01-15', '09:00'))
+
+    with writer.unit_of_work():
+        assert writer.save(AgendaEvent('Cena', '2024-01-15', '21:00'))
+        with reader.unit_of_work():
+            assert [e.evento for e in reader.find_by_date('2024-01-15')] == ['Dentista']
+
+    assert [e.evento for e in reader.find_by_date('2024-01-15')] == ['Dentista', 'Cena']
+
+
+def test_rolled_back_turn_discards_its_writes(tmp_path, serve):
+    path = serve(ExcelAgendaAdapter(str(tmp_path / 'agenda.xlsx')))
+    client = SocketAgendaRepositoryAdapter(path)
+
+    with pytest.raises(RuntimeError):
+        with client.unit_of_work():
+            client.save(AgendaEvent('Cena', '2024-01-15', '21:00'))
+            raise RuntimeError('turno fallido')
+
+    assert client.find_all() == []
+
+
+def test_timed_out_write_is_rolled_back(tmp_path, serve):
+    path = serve(SlowSaveAdapter(str(tmp_path / 'agenda.xlsx')))
+    client = SocketAgendaRepositoryAdapter(path, timeout=0.1)
+
+    assert not client.save(AgendaEvent('Cena', '2024-01-15', '21:00'))
+
+    time.sleep(0.8)
+    assert SocketAgendaRepositoryAdapter(path).find_all() == []
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from agenda_assistant.infrastructure.adapters.offline_llm import OfflineActionLLM
+from agenda_assistant.infrastructure.adapters.throttled_llm import ThrottledLLM, TokenBucket
+from agenda_assistant.infrastructure.hexagonal_configurator import HexagonalConfigurator
+
+
+class SlowLLM:
+    def __init__(self, delay=0.2, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.calls.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if self.error is not None:
+            raise self.error
+        return f"respuesta a {prompt}"
+
+
+def invoke_in_threads(llm, prompts):
+    results, errors = {}, {}
+
+    def call(i, prompt):
+        try:
+            results[i] = llm.invoke(prompt)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i, p)) for i, p in enumerate(prompts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    bucket = TokenBucket(rate=20, capacity=3)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.03
+    for _ in range(2):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=0)
+
+
+def test_identical_prompts_in_flight_share_one_call():
+    client = SlowLLM()
+    llm = ThrottledLLM(client, rate_per_second=1000, burst=100)
+
+    results, errors = invoke_in_threads(llm, ['hola'] * 5)
+
+    assert errors == {}
+    assert client.calls == ['hola']
+    assert set(results.values()) == {'respuesta a hola'}
+    metrics = llm.metrics()
+    assert (metrics['llm_calls'], metrics['llm_coalesced'], metrics['llm_in_flight']) == (1, 4, 0)
+
+
+def test_coalesced_callers_receive_the_leader_error():
+    llm = ThrottledLLM(SlowLLM(error=ConnectionError('cuota')), rate_per_second=1000, burst=100)
+
+    results, errors = invoke_in_threads(llm, ['hola'] * 3)
+
+    assert results == {}
+    assert len(errors) == 3 and all(isinstance(e, ConnectionError) for e in errors.values())
+    # Tras el fallo, una consulta nueva vuelve a llamar al cliente
+    with pytest.raises(ConnectionError):
+        llm.invoke('hola')
+
+
+def test_concurrency_is_capped():
+    client = SlowLLM(delay=0.05)
+    llm = ThrottledLLM(client, rate_per_second=1000, burst=100, max_concurrency=2)
+
+    results, errors = invoke_in_threads(llm, [f'p{i}' for i in range(6)])
+
+    assert errors == {} and len(results) == 6
+    assert client.max_active == 2
+
+
+def test_offline_batch_skips_the_limiter_unless_limits_are_given(monkeypatch, tmp_path):
+    monkeypatch.delenv('AGENDA_REPOSITORY_SOCKET', raising=False)
+    monkeypatch.setenv('AGENDA_FILE', str(tmp_path / 'agenda.xlsx'))
+    monkeypatch.setenv('AGENDA_ARCHIVE_DIR', str(tmp_path / 'agenda_archivo'))
+
+    batch = HexagonalConfigurator.wire_batch_dependencies(offline=True)
+    assert batch.metrics_provider is None
+    assert isinstance(batch.agent_factory('ana').llm, OfflineActionLLM)
+
+    batch = HexagonalConfigurator.wire_batch_dependencies(offline=True, rate_per_second=50)
+    llm = batch.agent_factory('ana').llm
+    assert isinstance(llm, ThrottledLLM)
+    assert llm._bucket.rate == 50
+    assert 'llm_calls' in batch.metrics_provider()
@@ -0,0 +1,114 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from agenda_assistant.domain.entities import AgendaEvent
+from agenda_assistant.infrastructure.adapters.excel_adapter import ExcelAgendaAdapter
+
+
+def event(nombre, hora='09:00'):
+    return AgendaEvent(nombre, '2024-01-15', hora)
+
+
+def names_on_disk(path):
+    return list(pd.read_excel(path)['Evento'])
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'agenda.xlsx')
+
+
+def test_commit_writes_once_at_the_end(path):
+    repository = ExcelAgendaAdapter(path)
+    with repository.unit_of_work():
+        repository.save(event('A'))
+        repository.save_many([event('B'), event('C')])
+        assert names_on_disk(path) == []
+        assert [e.evento for e in repository.find_by_date('2024-01-15')] == ['A', 'B', 'C']
+    assert names_on_disk(path) == ['A', 'B', 'C']
+
+
+def test_rollback_discards_buffered_writes_and_deferred_actions(path):
+    repository = ExcelAgendaAdapter(path)
+    actions = []
+    with pytest.raises(RuntimeError):
+        with repository.unit_of_work():
+            repository.save(event('A'))
+            repository._after_commit(lambda: actions.append('archivo'))
+            raise RuntimeError('turno fallido')
+    assert names_on_disk(path) == []
+    assert actions == []
+
+
+def test_nested_unit_rolls_back_to_its_savepoint(path):
+    repository = ExcelAgendaAdapter(path)
+    with repository.unit_of_work():
+        repository.save(event('A'))
+        with pytest.raises(RuntimeError):
+            with repository.unit_of_work():
+                repository.save(event('B'))
+                repository.save_many([event('C')])
+                raise RuntimeError('paso fallido')
+        repository.save(event('D'))
+    assert names_on_disk(path) == ['A', 'D']
+
+
+def test_unit_reloads_when_another_adapter_wrote_before_its_first_write(path):
+    session_a, session_b = ExcelAgendaAdapter(path), ExcelAgendaAdapter(path)
+    with session_a.unit_of_work():
+        assert session_a.find_all() == []
+        assert session_b.save(event('Nuevo'))
+        assert session_a.save(event('Propio'))
+    assert names_on_disk(path) == ['Nuevo', 'Propio']
+
+
+def test_writers_on_the_same_file_are_serialized_across_threads(path):
+    session_a, session_b = ExcelAgendaAdapter(path), ExcelAgendaAdapter(path)
+    saved = threading.Event()
+
+    def write_from_other_session():
+        session_b.save(event('B'))
+        saved.set()
+
+    with session_a.unit_of_work():
+        session_a.save(event('A'))
+        writer = threading.Thread(target=write_from_other_session)
+        writer.start()
+        assert not saved.wait(0.3)
+    writer.join(5)
+    assert names_on_disk(path) == ['A', 'B']
+
+
+def test_external_edit_during_the_unit_aborts_the_commit(path):
+    repository = ExcelAgendaAdapter(path)
+    with pytest.raises(RuntimeError):
+        with repository.unit_of_work():
+            repository.save(event('A'))
+            pd.DataFrame([['Manual', '2024-01-16', '10:00']],
+                         columns=['Evento', 'Fecha', 'Hora']).to_excel(path, index=False)
+    assert names_on_disk(path) == ['Manual']
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='usa fcntl')
+def test_writes_wait_for_the_lock_held_by_another_process(path):
+    repository = ExcelAgendaAdapter(path)
+    holder = subprocess.Popen([sys.executable, '-c', (
+        'import fcntl, sys, time\n'
+        f'handle = open({path + ".lock"!r}, "a+b")\n'
+        'fcntl.flock(handle.fileno(), fcntl.LOCK_EX)\n'
+        'print("ok", flush=True)\n'
+        'time.sleep(0.5)\n'
+    )], stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == 'ok'
+        start = time.monotonic()
+        assert repository.save(event('A'))
+        assert time.monotonic() - start >= 0.3
+    finally:
+        holder.wait(5)
+    assert names_on_disk(path) == ['A']